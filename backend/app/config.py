@@ -57,6 +57,7 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     session_expire_days: int = 7
+    bcrypt_rounds: int = 12  # bcrypt cost factor (2^rounds iterations)
 
     @property
     def cors_origins_list(self) -> list[str]:
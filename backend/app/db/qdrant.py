@@ -9,6 +9,20 @@ from app.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# int8 scalar quantization: a quarter of the float32 vector size, kept in RAM
+SCALAR_QUANTIZATION = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(
+        type=models.ScalarType.INT8,
+        quantile=0.99,
+        always_ram=True,
+    ),
+)
+
+# Rescore oversampled quantized candidates with the original vectors
+QUANTIZED_SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+
 
 class QdrantDatabase:
     """Qdrant vector database manager."""
@@ -55,6 +69,7 @@ class QdrantDatabase:
                         size=self.settings.qdrant_vector_size,
                         distance=models.Distance.COSINE,
                     ),
+                    quantization_config=SCALAR_QUANTIZATION,
                 )
                 logger.info(f"Created Qdrant collection: {collection_name}")
             else:
@@ -107,27 +122,48 @@ class QdrantDatabase:
     async def upsert_vectors(
         self,
         points: list[dict[str, Any]],
+        wait: bool = True,
     ) -> None:
         """Upsert vectors into the collection.
 
         Args:
             points: List of dicts with 'id', 'vector', and optional 'payload' keys.
+            wait: Whether to wait for the server to apply the changes before
+                returning. Bulk indexing passes False to overlap requests.
+        """
+        await self.upsert_batch(
+            ids=[point["id"] for point in points],
+            vectors=[point["vector"] for point in points],
+            payloads=[point.get("payload", {}) for point in points],
+            wait=wait,
+        )
+
+    async def upsert_batch(
+        self,
+        ids: list[str | int],
+        vectors: list[list[float]],
+        payloads: list[dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        """Upsert vectors given as parallel id, vector and payload lists.
+
+        Sends a single Batch instead of one PointStruct per point, which
+        skips per-point model construction and validation on large uploads.
+
+        Args:
+            ids: Point IDs.
+            vectors: Embedding vectors, aligned with ids.
+            payloads: Payload dicts, aligned with ids.
+            wait: Whether to wait for the server to apply the changes before
+                returning. Bulk indexing passes False to overlap requests.
         """
         if not self._client:
             raise RuntimeError("Qdrant not connected. Call connect() first.")
 
-        qdrant_points = [
-            models.PointStruct(
-                id=point["id"],
-                vector=point["vector"],
-                payload=point.get("payload", {}),
-            )
-            for point in points
-        ]
-
         await self._client.upsert(
             collection_name=self.settings.qdrant_collection_name,
-            points=qdrant_points,
+            points=models.Batch(ids=ids, vectors=vectors, payloads=payloads),
+            wait=wait,
         )
 
     async def search(
@@ -154,6 +190,7 @@ class QdrantDatabase:
             query=query_vector,
             limit=limit,
             score_threshold=score_threshold,
+            search_params=QUANTIZED_SEARCH_PARAMS,
         )
 
         return [
@@ -5,18 +5,26 @@ This module implements the POST /api/chat endpoint that:
 - Integrates with the RAG pipeline
 - Stores chat history in PostgreSQL
 
+POST /api/chat/stream answers the same request as newline-delimited JSON:
+a "sources" event, then "token" events as the answer is generated, then a
+"done" event (or an "error" event if generation fails part-way).
+
 Requirements: 5.1, 5.2
 """
 
+import json
 import logging
 import uuid
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.rag_service import RAGService, RAGRequest, get_rag_service
+from app.services.response_generator import StreamedResponse
 from app.db.postgres import get_postgres_db
 
 logger = logging.getLogger(__name__)
@@ -101,6 +109,16 @@ class ChatResponse(BaseModel):
     is_fallback: bool = Field(default=False, description="Whether this is a fallback response")
 
 
+def _to_source(source: dict[str, Any]) -> Source:
+    """Convert a RAG source dictionary to the API source model."""
+    return Source(
+        chapter_id=source.get("chapter_id", "unknown"),
+        section_title=source.get("section_title", "Unknown Section"),
+        page_url=source.get("page_url", ""),
+        relevance_score=source.get("relevance_score", 0.0),
+    )
+
+
 async def get_db_session():
     """Dependency to get database session."""
     try:
@@ -197,15 +215,7 @@ async def chat(
         rag_response = await rag_service.process_query(rag_request)
 
         # Convert sources to response format
-        sources = [
-            Source(
-                chapter_id=s.get("chapter_id", "unknown"),
-                section_title=s.get("section_title", "Unknown Section"),
-                page_url=s.get("page_url", ""),
-                relevance_score=s.get("relevance_score", 0.0),
-            )
-            for s in rag_response.sources
-        ]
+        sources = [_to_source(s) for s in rag_response.sources]
 
         # Store chat message in database (async, non-blocking on failure)
         await store_chat_message(
@@ -229,3 +239,103 @@ async def chat(
             status_code=500,
             detail="An error occurred while processing your request. Please try again.",
         )
+
+
+def _ndjson(event: dict[str, Any]) -> str:
+    """Serialize one stream event as a line of JSON."""
+    return json.dumps(event) + "\n"
+
+
+async def _stream_chat_events(
+    request: ChatRequest,
+    streamed: StreamedResponse,
+) -> AsyncIterator[str]:
+    """Yield stream events for a chat answer, then store the full message.
+
+    Args:
+        request: The validated chat request.
+        streamed: Streamed RAG response for the request.
+
+    Yields:
+        Newline-delimited JSON events.
+    """
+    sources = [s.to_dict() for s in streamed.sources]
+    yield _ndjson(
+        {
+            "type": "sources",
+            "sources": [_to_source(s).model_dump() for s in sources],
+            "is_fallback": streamed.is_fallback,
+        }
+    )
+
+    pieces: list[str] = []
+    try:
+        async for piece in streamed.text_stream:
+            pieces.append(piece)
+            yield _ndjson({"type": "token", "content": piece})
+    except Exception as e:
+        logger.error(f"Error streaming chat response: {e}", exc_info=True)
+        yield _ndjson(
+            {
+                "type": "error",
+                "detail": "An error occurred while processing your request. Please try again.",
+            }
+        )
+        return
+
+    # The request's dependencies may already be torn down once the body is
+    # streaming, so open a session of our own for the history write
+    async for db_session in get_db_session():
+        await store_chat_message(
+            session=db_session,
+            query=request.query,
+            response="".join(pieces),
+            sources=sources,
+            selected_text=request.selected_text,
+            user_id=request.user_id,
+        )
+
+    yield _ndjson({"type": "done"})
+
+
+@router.post("/stream")
+async def chat_stream(
+    request: ChatRequest,
+    rag_service: RAGService = Depends(get_rag_service),
+) -> StreamingResponse:
+    """Process a chat request and stream the response as it is generated.
+
+    Sources are sent first, followed by the answer text in pieces, so the
+    client can render tokens without waiting for the full completion.
+
+    Args:
+        request: The chat request with query and optional context.
+        rag_service: The RAG service for processing queries.
+
+    Returns:
+        StreamingResponse of newline-delimited JSON events.
+
+    Raises:
+        HTTPException: If retrieval fails before streaming starts.
+    """
+    logger.info(f"Processing streamed chat request: query='{request.query[:50]}...'")
+
+    try:
+        streamed = await rag_service.process_query_stream(
+            RAGRequest(
+                query=request.query,
+                selected_text=request.selected_text,
+                user_id=request.user_id,
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error processing chat request: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while processing your request. Please try again.",
+        )
+
+    return StreamingResponse(
+        _stream_chat_events(request, streamed),
+        media_type="application/x-ndjson",
+    )
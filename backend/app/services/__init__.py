@@ -13,6 +13,7 @@ from app.services.context_builder import (
     BuiltContext,
     get_context_builder,
 )
+from app.services.embedding_cache import EmbeddingCache
 from app.services.embedding_service import (
     EmbeddingService,
     EmbeddingResult,
@@ -29,6 +30,7 @@ from app.services.indexer_service import (
 from app.services.query_processor import (
     QueryProcessor,
     ProcessedQuery,
+    QueryEmbeddingCache,
     get_query_processor,
 )
 from app.services.rag_service import (
@@ -41,6 +43,7 @@ from app.services.response_generator import (
     ResponseGenerator,
     GeneratedResponse,
     Source,
+    StreamedResponse,
     get_response_generator,
     close_response_generator,
 )
@@ -86,6 +89,8 @@ __all__ = [
     "ContextBuilder",
     "BuiltContext",
     "get_context_builder",
+    # Embedding cache
+    "EmbeddingCache",
     # Embedding service
     "EmbeddingService",
     "EmbeddingResult",
@@ -100,6 +105,7 @@ __all__ = [
     # Query processor
     "QueryProcessor",
     "ProcessedQuery",
+    "QueryEmbeddingCache",
     "get_query_processor",
     # RAG service
     "RAGService",
@@ -110,6 +116,7 @@ __all__ = [
     "ResponseGenerator",
     "GeneratedResponse",
     "Source",
+    "StreamedResponse",
     "get_response_generator",
     "close_response_generator",
     # Retriever service
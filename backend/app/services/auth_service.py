@@ -70,9 +70,14 @@ class AuthResponse(BaseModel):
 class AuthService:
     """Service for handling authentication operations."""
 
-    def __init__(self):
-        """Initialize auth service with settings."""
+    def __init__(self, rounds: Optional[int] = None):
+        """Initialize auth service with settings.
+
+        Args:
+            rounds: bcrypt cost factor. Uses config settings if not provided.
+        """
         self.settings = get_settings()
+        self._rounds = rounds or self.settings.bcrypt_rounds
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
@@ -83,7 +88,7 @@ class AuthService:
 
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self._rounds)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
 
@@ -9,11 +9,27 @@ Requirements: 4.1
 """
 
 import hashlib
+import os
+import pickle
 import re
-from dataclasses import dataclass, field
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Iterator
 
+# Namespace for deterministic UUID v5 chunk IDs. Changing it changes every
+# chunk ID and orphans previously indexed points.
+CHUNK_ID_NAMESPACE = uuid.UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")
+
+# Default on-disk cache for parsed content: backend/.cache/parsed
+DEFAULT_PARSE_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "parsed"
+
+# Bump whenever parsing output changes so stale cache entries are ignored
+PARSE_CACHE_VERSION = 3
+
 
 @dataclass
 class ContentMetadata:
@@ -65,28 +81,92 @@ class ContentParser:
 
     # Patterns for MDX/Docusaurus-specific elements to remove or process
     FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+    FRONTMATTER_TITLE_PATTERN = re.compile(r'title:\s*["\']?(.+?)["\']?\s*$', re.MULTILINE)
+    FRONTMATTER_POSITION_PATTERN = re.compile(r"sidebar_position:\s*(\d+)")
     MDX_IMPORT_PATTERN = re.compile(r"^import\s+.*?$", re.MULTILINE)
     MDX_EXPORT_PATTERN = re.compile(r"^export\s+.*?$", re.MULTILINE)
     JSX_COMPONENT_PATTERN = re.compile(r"<[A-Z][a-zA-Z]*[^>]*>.*?</[A-Z][a-zA-Z]*>", re.DOTALL)
     JSX_SELF_CLOSING_PATTERN = re.compile(r"<[A-Z][a-zA-Z]*[^>]*/\s*>")
-    MERMAID_PATTERN = re.compile(r"```mermaid\n.*?```", re.DOTALL)
-    CODE_BLOCK_PATTERN = re.compile(r"```[\w]*\n.*?```", re.DOTALL)
-    ADMONITION_PATTERN = re.compile(r":::(tip|note|caution|warning|info|danger)\s*(.*?)\n(.*?):::", re.DOTALL)
+    # Mermaid diagrams, code blocks and admonitions combined into one
+    # alternation so the document is scanned once. The mermaid branch must
+    # come before the generic code branch.
+    BLOCK_PATTERN = re.compile(
+        r"(?P<mermaid>```mermaid\n.*?```)"
+        r"|(?P<code>```[\w]*\n.*?```)"
+        r"|(?P<admonition>:::(?P<admon_type>tip|note|caution|warning|info|danger)"
+        r"[ \t]*(?P<admon_title>(?:(?!```)[^\n])*)\n(?P<admon_body>.*?):::)",
+        re.DOTALL,
+    )
     HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
     LINK_PATTERN = re.compile(r"\[([^\]]+)\]\([^)]+\)")
     IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\([^)]+\)")
+    CODE_LANG_PATTERN = re.compile(r"```(\w+)")
+    CODE_FENCE_PATTERN = re.compile(r"```\w*\n?")
+    EXCESS_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+    FILE_EXTENSION_PATTERN = re.compile(r"\.(mdx?|md)$")
 
-    def __init__(self, base_url: str = ""):
-        """Initialize parser with base URL for generating page URLs."""
+    def __init__(self, base_url: str = "", cache_dir: Path | None = None):
+        """Initialize parser with base URL for generating page URLs.
+
+        Args:
+            base_url: Base URL for generating page URLs.
+            cache_dir: Optional directory for persisting parsed content
+                across runs, keyed by a hash of the file content.
+        """
         self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
 
     def parse_file(self, file_path: Path) -> ParsedContent:
-        """Parse a markdown/MDX file and extract content with metadata."""
-        raw_content = file_path.read_text(encoding="utf-8")
-        return self.parse_content(raw_content, file_path)
+        """Parse a markdown/MDX file and extract content with metadata.
+
+        Results are cached per (file, mtime, size), so re-indexing an
+        unchanged docs tree in the same process skips parsing entirely.
+        Each call returns its own copy, so callers may modify it freely.
+        """
+        stat = file_path.stat()
+        cached = _parse_file_cached(
+            self.base_url, self.cache_dir, file_path, stat.st_mtime_ns, stat.st_size
+        )
+        return replace(
+            cached,
+            metadata=replace(cached.metadata),
+            sections=list(cached.sections),
+        )
 
     def parse_content(self, raw_content: str, file_path: Path) -> ParsedContent:
-        """Parse raw markdown/MDX content."""
+        """Parse raw markdown/MDX content.
+
+        When a cache_dir is configured, previously parsed content with the
+        same text, path and base URL is loaded from disk instead. A changed
+        file hashes to a new key, so entries never go stale.
+        """
+        if self.cache_dir is None:
+            return self._parse_content(raw_content, file_path)
+
+        key = hashlib.blake2b(
+            f"{PARSE_CACHE_VERSION}\0{self.base_url}\0{file_path}\0{raw_content}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        cache_path = self.cache_dir / f"{key}.pkl"
+
+        try:
+            return pickle.loads(cache_path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        parsed = self._parse_content(raw_content, file_path)
+
+        # Write to a temporary file first so concurrent workers never see
+        # a partially written entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path.replace(cache_path)
+
+        return parsed
+
+    def _parse_content(self, raw_content: str, file_path: Path) -> ParsedContent:
+        """Parse raw markdown/MDX content without consulting the cache."""
         # Extract frontmatter metadata
         metadata = self._extract_metadata(raw_content, file_path)
 
@@ -118,12 +198,12 @@ class ContentParser:
         if frontmatter_match:
             frontmatter = frontmatter_match.group(1)
             # Extract title
-            title_match = re.search(r'title:\s*["\']?(.+?)["\']?\s*$', frontmatter, re.MULTILINE)
+            title_match = self.FRONTMATTER_TITLE_PATTERN.search(frontmatter)
             if title_match:
                 title = title_match.group(1).strip().strip('"\'')
 
             # Extract sidebar_position
-            position_match = re.search(r"sidebar_position:\s*(\d+)", frontmatter)
+            position_match = self.FRONTMATTER_POSITION_PATTERN.search(frontmatter)
             if position_match:
                 sidebar_position = int(position_match.group(1))
 
@@ -154,7 +234,7 @@ class ContentParser:
 
         # Remove file extension and join
         url_path = "/".join(url_parts)
-        url_path = re.sub(r"\.(mdx?|md)$", "", url_path)
+        url_path = self.FILE_EXTENSION_PATTERN.sub("", url_path)
 
         return f"{self.base_url}/{url_path}"
 
@@ -166,29 +246,8 @@ class ContentParser:
         text = self.MDX_IMPORT_PATTERN.sub("", text)
         text = self.MDX_EXPORT_PATTERN.sub("", text)
 
-        # Remove mermaid diagrams (keep a placeholder)
-        text = self.MERMAID_PATTERN.sub("[Diagram]", text)
-
-        # Process code blocks - keep the code but mark it
-        def process_code_block(match: re.Match) -> str:
-            code = match.group(0)
-            # Extract language if present
-            lang_match = re.match(r"```(\w+)", code)
-            lang = lang_match.group(1) if lang_match else "code"
-            # Extract code content
-            code_content = re.sub(r"```\w*\n?", "", code).strip()
-            return f"[Code example in {lang}]: {code_content[:200]}..." if len(code_content) > 200 else f"[Code example in {lang}]: {code_content}"
-
-        text = self.CODE_BLOCK_PATTERN.sub(process_code_block, text)
-
-        # Process admonitions - keep the content
-        def process_admonition(match: re.Match) -> str:
-            admon_type = match.group(1)
-            title = match.group(2).strip() if match.group(2) else admon_type.title()
-            content = match.group(3).strip()
-            return f"{title}: {content}"
-
-        text = self.ADMONITION_PATTERN.sub(process_admonition, text)
+        # Replace mermaid diagrams, code blocks and admonitions in one pass
+        text = self.BLOCK_PATTERN.sub(self._replace_block, text)
 
         # Remove JSX components
         text = self.JSX_COMPONENT_PATTERN.sub("", text)
@@ -201,11 +260,33 @@ class ContentParser:
         text = self.IMAGE_PATTERN.sub(r"[Image: \1]", text)
 
         # Clean up extra whitespace
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = self.EXCESS_NEWLINES_PATTERN.sub("\n\n", text)
         text = text.strip()
 
         return text
 
+    def _replace_block(self, match: re.Match) -> str:
+        """Replace a block matched by BLOCK_PATTERN with plain text."""
+        if match.group("mermaid"):
+            # Remove mermaid diagrams (keep a placeholder)
+            return "[Diagram]"
+
+        if match.group("code"):
+            # Keep the code but mark it
+            code = match.group("code")
+            lang_match = self.CODE_LANG_PATTERN.match(code)
+            lang = lang_match.group(1) if lang_match else "code"
+            code_content = self.CODE_FENCE_PATTERN.sub("", code).strip()
+            if len(code_content) > 200:
+                return f"[Code example in {lang}]: {code_content[:200]}..."
+            return f"[Code example in {lang}]: {code_content}"
+
+        # Admonition - keep the content, processing any nested blocks
+        admon_title = match.group("admon_title")
+        title = admon_title.strip() if admon_title else match.group("admon_type").title()
+        content = self.BLOCK_PATTERN.sub(self._replace_block, match.group("admon_body")).strip()
+        return f"{title}: {content}"
+
     def _extract_sections(self, content: str) -> list[tuple[str, str]]:
         """Extract sections based on headings."""
         sections = []
@@ -231,9 +312,30 @@ class ContentParser:
         return sections
 
 
+@lru_cache(maxsize=4096)
+def _parse_file_cached(
+    base_url: str,
+    cache_dir: Path | None,
+    file_path: Path,
+    mtime_ns: int,
+    size: int,
+) -> ParsedContent:
+    """Parse a file, memoized on its path and stat signature.
+
+    mtime_ns and size are only part of the cache key; a modified file gets
+    a new key and is parsed again.
+    """
+    raw_content = file_path.read_text(encoding="utf-8")
+    parser = ContentParser(base_url=base_url, cache_dir=cache_dir)
+    return parser.parse_content(raw_content, file_path)
+
+
 class ContentChunker:
     """Semantic chunker for textbook content."""
 
+    PARAGRAPH_SPLIT_PATTERN = re.compile(r"\n\n+")
+    SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
     def __init__(
         self,
         chunk_size: int = 500,
@@ -305,8 +407,9 @@ class ContentChunker:
             return
 
         # Split by paragraphs first
-        paragraphs = re.split(r"\n\n+", text)
+        paragraphs = self.PARAGRAPH_SPLIT_PATTERN.split(text)
         current_chunk = []
+        current_sizes = []  # Token estimate per paragraph in current_chunk
         current_size = 0
 
         for para in paragraphs:
@@ -322,6 +425,7 @@ class ContentChunker:
                 if current_chunk:
                     yield "\n\n".join(current_chunk)
                     current_chunk = []
+                    current_sizes = []
                     current_size = 0
 
                 # Split large paragraph by sentences
@@ -333,21 +437,23 @@ class ContentChunker:
             if current_size + para_tokens > self.chunk_size and current_chunk:
                 yield "\n\n".join(current_chunk)
 
-                # Keep overlap - take last paragraph(s) up to overlap size
-                overlap_chunks = []
+                # Keep overlap - take last paragraph(s) up to overlap size,
+                # reusing the token estimates computed when they were added
+                overlap_start = len(current_chunk)
                 overlap_size = 0
-                for prev_para in reversed(current_chunk):
-                    prev_size = self.estimate_tokens(prev_para)
-                    if overlap_size + prev_size <= self.chunk_overlap:
-                        overlap_chunks.insert(0, prev_para)
-                        overlap_size += prev_size
-                    else:
+                while overlap_start > 0:
+                    prev_size = current_sizes[overlap_start - 1]
+                    if overlap_size + prev_size > self.chunk_overlap:
                         break
+                    overlap_start -= 1
+                    overlap_size += prev_size
 
-                current_chunk = overlap_chunks
+                current_chunk = current_chunk[overlap_start:]
+                current_sizes = current_sizes[overlap_start:]
                 current_size = overlap_size
 
             current_chunk.append(para)
+            current_sizes.append(para_tokens)
             current_size += para_tokens
 
         # Yield remaining content
@@ -357,7 +463,7 @@ class ContentChunker:
     def _split_large_paragraph(self, paragraph: str) -> Iterator[str]:
         """Split a large paragraph by sentences."""
         # Simple sentence splitting
-        sentences = re.split(r"(?<=[.!?])\s+", paragraph)
+        sentences = self.SENTENCE_SPLIT_PATTERN.split(paragraph)
         current_chunk = []
         current_size = 0
 
@@ -384,12 +490,38 @@ class ContentChunker:
 
         Qdrant requires point IDs to be either unsigned integers or valid UUIDs.
         We generate a deterministic UUID v5 based on the content identifiers.
+        The hashed key is a short identifier string, not the chunk content,
+        so the cost is independent of chunk size.
         """
-        import uuid
-        # Use UUID v5 with a namespace to generate deterministic UUIDs
-        namespace = uuid.UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")  # URL namespace
         content = f"{chapter_id}:{section_title}:{position}"
-        return str(uuid.uuid5(namespace, content))
+        return str(uuid.uuid5(CHUNK_ID_NAMESPACE, content))
+
+
+# Below this many files, process pool startup costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 64
+
+
+def _parse_and_chunk_file(
+    file_path: Path,
+    base_url: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    cache_dir: Path | None = None,
+) -> tuple[list[ContentChunk], str | None]:
+    """Parse and chunk a single file.
+
+    Module-level so it can be dispatched to worker processes. Errors are
+    returned rather than raised so one bad file does not abort the others.
+
+    Returns:
+        Tuple of (chunks, error message or None).
+    """
+    try:
+        parsed = ContentParser(base_url=base_url, cache_dir=cache_dir).parse_file(file_path)
+        chunker = ContentChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        return chunker.chunk_content(parsed), None
+    except Exception as e:
+        return [], f"Error parsing {file_path}: {e}"
 
 
 def parse_textbook_directory(
@@ -397,36 +529,59 @@ def parse_textbook_directory(
     base_url: str = "",
     chunk_size: int = 500,
     chunk_overlap: int = 50,
+    max_workers: int | None = None,
+    cache_dir: Path | None = None,
 ) -> list[ContentChunk]:
     """Parse all markdown/MDX files in a textbook docs directory.
 
+    Parsing is CPU-bound, so large trees are spread across a process pool.
+    Small trees are parsed in-process, where the parse_file cache applies.
+
     Args:
         docs_path: Path to the docs directory.
         base_url: Base URL for generating page URLs.
         chunk_size: Target chunk size in tokens.
         chunk_overlap: Token overlap between chunks.
+        max_workers: Worker processes for parsing. Defaults to the CPU
+            count; 1 forces in-process parsing.
+        cache_dir: Optional directory for persisting parsed content.
 
     Returns:
         List of all content chunks from all files.
     """
-    parser = ContentParser(base_url=base_url)
-    chunker = ContentChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    # Find all markdown/MDX files, skipping template files
+    file_paths = [
+        file_path
+        for pattern in ["**/*.md", "**/*.mdx"]
+        for file_path in docs_path.glob(pattern)
+        if "_templates" not in file_path.relative_to(docs_path).parts
+    ]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers > 1 and len(file_paths) >= PARALLEL_PARSE_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _parse_and_chunk_file,
+                    file_paths,
+                    repeat(base_url),
+                    repeat(chunk_size),
+                    repeat(chunk_overlap),
+                    repeat(cache_dir),
+                    chunksize=8,
+                )
+            )
+    else:
+        results = [
+            _parse_and_chunk_file(file_path, base_url, chunk_size, chunk_overlap, cache_dir)
+            for file_path in file_paths
+        ]
 
     all_chunks = []
-
-    # Find all markdown/MDX files
-    for pattern in ["**/*.md", "**/*.mdx"]:
-        for file_path in docs_path.glob(pattern):
-            # Skip template files
-            if "_templates" in str(file_path):
-                continue
-
-            try:
-                parsed = parser.parse_file(file_path)
-                chunks = chunker.chunk_content(parsed)
-                all_chunks.extend(chunks)
-            except Exception as e:
-                # Log error but continue processing other files
-                print(f"Error parsing {file_path}: {e}")
+    for chunks, error in results:
+        if error:
+            # Log error but continue processing other files
+            print(error)
+        all_chunks.extend(chunks)
 
     return all_chunks
@@ -9,7 +9,9 @@ Requirements: 3.1
 """
 
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
+from itertools import accumulate
 
 from app.services.retriever_service import RetrievedChunk
 
@@ -100,9 +102,7 @@ class ContextBuilder:
             )
 
         context_parts: list[str] = []
-        chunks_used: list[RetrievedChunk] = []
         current_tokens = 0
-        truncated = False
 
         # Add selected text context first if provided
         if selected_text:
@@ -117,23 +117,22 @@ class ContextBuilder:
         context_parts.append(header)
         current_tokens += header_tokens
 
-        # Add chunks in order of relevance (already sorted)
-        for i, chunk in enumerate(chunks):
-            if len(chunks_used) >= self.max_chunks:
-                truncated = True
-                break
-
-            formatted = self._format_chunk(chunk, len(chunks_used) + 1)
-            chunk_tokens = self._estimate_tokens(formatted)
-
-            # Check if adding this chunk would exceed token limit
-            if current_tokens + chunk_tokens > self.max_tokens:
-                truncated = True
-                break
+        # Chunks are taken in order of relevance (already sorted), so the
+        # ones used are the longest prefix whose running token total fits.
+        formatted_chunks = [
+            self._format_chunk(chunk, i + 1)
+            for i, chunk in enumerate(chunks[: self.max_chunks])
+        ]
+        cumulative_tokens = list(
+            accumulate(self._estimate_tokens(formatted) for formatted in formatted_chunks)
+        )
+        cutoff = bisect_right(cumulative_tokens, self.max_tokens - current_tokens)
 
-            context_parts.append(formatted)
-            chunks_used.append(chunk)
-            current_tokens += chunk_tokens
+        context_parts.extend(formatted_chunks[:cutoff])
+        chunks_used = chunks[:cutoff]
+        if cutoff:
+            current_tokens += cumulative_tokens[cutoff - 1]
+        truncated = cutoff < len(chunks)
 
         context_text = "\n".join(context_parts)
 
@@ -0,0 +1,199 @@
+"""Persistent embedding cache backed by SQLite.
+
+This module provides functionality to:
+- Store embeddings keyed by a hash of the model name and input text
+- Look up cached embeddings so unchanged content is not re-embedded
+- Reuse embeddings across whitespace-only edits
+- Partition a list of texts into cached and missing entries
+
+Requirements: 4.1, 4.3
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Default cache location: backend/.cache/embeddings.db
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "embeddings.db"
+
+# Bump whenever cache keys or the storage format change; a database stamped
+# with another version is cleared on open instead of silently missing
+EMBEDDING_CACHE_VERSION = 3
+
+# Runs of whitespace collapsed when normalizing text for near-duplicate lookups
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Stay well below SQLite's bound-parameter limit
+_QUERY_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """On-disk cache mapping (model, text) to an embedding vector.
+
+    Vectors are stored as packed float32 bytes, which halves storage
+    compared to float64 and is more than enough precision for cosine search.
+
+    Each entry is also indexed by a hash of its whitespace-collapsed text, so
+    an edit that only reflows a chunk still hits the cache instead of being
+    re-embedded. Case is preserved: "ROS" and "ros" are embedded separately.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH):
+        """Open (and create if needed) the cache database.
+
+        A database written with a different EMBEDDING_CACHE_VERSION is
+        emptied, since its keys would never match.
+
+        Args:
+            path: Path to the SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != EMBEDDING_CACHE_VERSION:
+            logger.info(
+                f"Embedding cache at {self.path} has version {version}, "
+                f"expected {EMBEDDING_CACHE_VERSION}; clearing it"
+            )
+            self._conn.execute("DROP TABLE IF EXISTS emb")
+            self._conn.execute("DROP TABLE IF EXISTS emb_norm")
+            self._conn.execute(f"PRAGMA user_version = {EMBEDDING_CACHE_VERSION}")
+
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb_norm "
+            "(norm_hash BLOB PRIMARY KEY, emb_hash BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> bytes:
+        """Build the cache key for a text embedded with a given model."""
+        return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+    @classmethod
+    def make_normalized_key(cls, model: str, text: str) -> bytes:
+        """Build the near-duplicate key for a text embedded with a given model."""
+        normalized = _WHITESPACE_PATTERN.sub(" ", text).strip()
+        return cls.make_key(model, normalized)
+
+    def get_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+    ) -> list[list[float] | None]:
+        """Look up cached embeddings.
+
+        Args:
+            model: Embedding model name.
+            texts: Texts to look up.
+
+        Returns:
+            A list aligned with texts containing the cached vector or None.
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        found = self._select(
+            "SELECT hash, vec FROM emb WHERE hash IN ({})", keys
+        )
+        results = [found.get(key) for key in keys]
+
+        # Fall back to the normalized text for entries with no exact match
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing:
+            norm_keys = [self.make_normalized_key(model, texts[i]) for i in missing]
+            near = self._select(
+                "SELECT n.norm_hash, e.vec FROM emb_norm n "
+                "JOIN emb e ON e.hash = n.emb_hash WHERE n.norm_hash IN ({})",
+                norm_keys,
+            )
+            for i, norm_key in zip(missing, norm_keys):
+                results[i] = near.get(norm_key)
+
+        return results
+
+    def _select(self, query: str, keys: Sequence[bytes]) -> dict[bytes, list[float]]:
+        """Run a (key, vector) lookup query over keys in batches.
+
+        Args:
+            query: SQL with a single {} placeholder for the IN list.
+            keys: Keys to look up.
+
+        Returns:
+            Mapping from found key to its decoded vector.
+        """
+        found: dict[bytes, list[float]] = {}
+        for i in range(0, len(keys), _QUERY_BATCH_SIZE):
+            batch = keys[i : i + _QUERY_BATCH_SIZE]
+            rows = self._conn.execute(query.format(",".join("?" * len(batch))), batch)
+            for key, blob in rows:
+                vector = array("f")
+                vector.frombytes(blob)
+                found[key] = vector.tolist()
+        return found
+
+    def put_many(
+        self,
+        model: str,
+        items: Sequence[tuple[str, Sequence[float]]],
+    ) -> None:
+        """Store embeddings in the cache.
+
+        Args:
+            model: Embedding model name.
+            items: (text, embedding) pairs to store.
+        """
+        keys = [self.make_key(model, text) for text, _ in items]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO emb (hash, vec) VALUES (?, ?)",
+            [
+                (key, array("f", embedding).tobytes())
+                for key, (_, embedding) in zip(keys, items)
+            ],
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO emb_norm (norm_hash, emb_hash) VALUES (?, ?)",
+            [
+                (self.make_normalized_key(model, text), key)
+                for key, (text, _) in zip(keys, items)
+            ],
+        )
+        self._conn.commit()
+
+    def find_uncached_texts(
+        self,
+        model: str,
+        texts: Sequence[str],
+    ) -> tuple[dict[int, list[float]], list[int]]:
+        """Partition texts into cached and missing entries.
+
+        Args:
+            model: Embedding model name.
+            texts: Texts to check.
+
+        Returns:
+            Tuple of (cached vectors by index, indices of uncached texts).
+        """
+        cached: dict[int, list[float]] = {}
+        missing: list[int] = []
+        for i, vector in enumerate(self.get_many(model, texts)):
+            if vector is None:
+                missing.append(i)
+            else:
+                cached[i] = vector
+
+        logger.info(f"Embedding cache: {len(cached)} hits, {len(missing)} misses")
+        return cached, missing
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
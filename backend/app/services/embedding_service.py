@@ -39,6 +39,7 @@ class EmbeddingService:
     # Batch processing configuration
     MAX_BATCH_SIZE = 100  # OpenAI allows up to 2048 inputs per request
     MAX_TOKENS_PER_BATCH = 8000  # Conservative limit for batch token count
+    MAX_CONCURRENT_BATCHES = 4  # Batch requests allowed in flight at once
 
     # Retry configuration
     MAX_RETRIES = 3
@@ -103,15 +104,23 @@ class EmbeddingService:
         if not texts:
             return []
 
-        # Process in batches
-        all_results: list[EmbeddingResult] = []
+        # Process batches concurrently, bounded to avoid tripping rate limits
         batches = self._create_batches(list(texts))
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_BATCHES)
+
+        async def process_bounded(batch_idx: int, batch: list[str]) -> list[EmbeddingResult]:
+            async with semaphore:
+                logger.debug(f"Processing batch {batch_idx + 1}/{len(batches)} with {len(batch)} texts")
+                return await self._process_batch_with_retry(batch)
 
-        for batch_idx, batch in enumerate(batches):
-            logger.debug(f"Processing batch {batch_idx + 1}/{len(batches)} with {len(batch)} texts")
-            batch_results = await self._process_batch_with_retry(batch)
-            all_results.extend(batch_results)
+        # gather preserves batch order, so results line up with the input
+        batch_results = await asyncio.gather(
+            *(process_bounded(i, batch) for i, batch in enumerate(batches))
+        )
 
+        all_results: list[EmbeddingResult] = []
+        for results in batch_results:
+            all_results.extend(results)
         return all_results
 
     def _create_batches(self, texts: list[str]) -> list[list[str]]:
@@ -8,6 +8,7 @@ This module provides functionality to:
 Requirements: 4.1, 4.3
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,7 +22,9 @@ from app.services.content_parser import (
     ContentChunk,
     parse_textbook_directory,
 )
+from app.services.embedding_cache import EmbeddingCache
 from app.services.embedding_service import (
+    EmbeddingResult,
     EmbeddingService,
     get_embedding_service,
 )
@@ -54,21 +57,31 @@ class QdrantIndexer:
     """Service for indexing content into Qdrant vector database."""
 
     # Batch size for upsert operations
-    UPSERT_BATCH_SIZE = 100
+    UPSERT_BATCH_SIZE = 64
+
+    # Maximum number of upsert requests in flight at once
+    UPSERT_CONCURRENCY = 4
+
+    # Maximum number of batches being embedded at once
+    EMBED_CONCURRENCY = 2
 
     def __init__(
         self,
         qdrant_db: QdrantDatabase | None = None,
         embedding_service: EmbeddingService | None = None,
+        embedding_cache: EmbeddingCache | None = None,
     ):
         """Initialize indexer with database and embedding service.
 
         Args:
             qdrant_db: Qdrant database instance. Uses global if not provided.
             embedding_service: Embedding service instance. Uses global if not provided.
+            embedding_cache: Optional persistent cache. When set, only chunks
+                whose content is not cached are sent to the embedding API.
         """
         self._qdrant_db = qdrant_db
         self._embedding_service = embedding_service
+        self._embedding_cache = embedding_cache
 
     @property
     def qdrant_db(self) -> QdrantDatabase:
@@ -87,11 +100,25 @@ class QdrantIndexer:
     async def index_chunks(
         self,
         chunks: list[ContentChunk],
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        embed_workers: int | None = None,
     ) -> IndexingResult:
         """Index a list of content chunks into Qdrant.
 
+        Embedding and upserting run as a producer-consumer pipeline: embed
+        workers push finished batches onto a bounded queue that upload
+        workers drain, so embedding API calls overlap with Qdrant writes.
+        The queue holds at most two batches per upload worker, which keeps
+        embedding from running far ahead of a slow upload.
+
         Args:
             chunks: List of content chunks to index.
+            batch_size: Points per upsert request. Defaults to UPSERT_BATCH_SIZE.
+            concurrency: Maximum concurrent upsert requests.
+                Defaults to UPSERT_CONCURRENCY.
+            embed_workers: Maximum batches being embedded at once.
+                Defaults to EMBED_CONCURRENCY.
 
         Returns:
             IndexingResult with statistics about the operation.
@@ -107,59 +134,73 @@ class QdrantIndexer:
 
         logger.info(f"Starting indexing of {len(chunks)} chunks")
 
+        batch_size = batch_size or self.UPSERT_BATCH_SIZE
+        concurrency = concurrency or self.UPSERT_CONCURRENCY
+        embed_workers = embed_workers or self.EMBED_CONCURRENCY
+
         # Track chapters processed
         chapters = set()
         errors = []
         indexed_count = 0
         failed_count = 0
 
-        # Generate embeddings for all chunks
-        texts = [chunk.content for chunk in chunks]
-        try:
-            embedding_results = await self.embedding_service.generate_embeddings(texts)
-        except Exception as e:
-            logger.error(f"Failed to generate embeddings: {e}")
-            return IndexingResult(
-                total_chunks=len(chunks),
-                indexed_chunks=0,
-                failed_chunks=len(chunks),
-                chapters_processed=[],
-                errors=[f"Embedding generation failed: {str(e)}"],
-            )
+        pending: asyncio.Queue[tuple[int, list[ContentChunk]]] = asyncio.Queue()
+        for i in range(0, len(chunks), batch_size):
+            pending.put_nowait((i // batch_size + 1, chunks[i : i + batch_size]))
+        embedded: asyncio.Queue[tuple[int, list[IndexedChunk]] | None] = asyncio.Queue(
+            maxsize=2 * concurrency
+        )
 
-        # Prepare indexed chunks with embeddings
-        indexed_chunks = []
-        for chunk, embedding_result in zip(chunks, embedding_results):
-            chapters.add(chunk.metadata.chapter_id)
-            indexed_chunks.append(
-                IndexedChunk(
-                    id=chunk.id,
-                    content=chunk.content,
-                    embedding=embedding_result.embedding,
-                    metadata={
-                        "chapter_id": chunk.metadata.chapter_id,
-                        "title": chunk.metadata.title,
-                        "section_title": chunk.metadata.section_title,
-                        "page_url": chunk.metadata.page_url,
-                        "position": chunk.position,
-                        "token_count": chunk.token_count,
-                        "content": chunk.content,  # Store content for retrieval
-                    },
+        async def embed_worker() -> None:
+            nonlocal failed_count
+            while not pending.empty():
+                batch_num, batch = pending.get_nowait()
+                try:
+                    results = await self._generate_embeddings(
+                        [chunk.content for chunk in batch]
+                    )
+                except Exception as e:
+                    error_msg = f"Embedding generation failed for batch {batch_num}: {str(e)}"
+                    logger.error(error_msg)
+                    failed_count += len(batch)
+                    errors.append(error_msg)
+                    continue
+
+                chapters.update(chunk.metadata.chapter_id for chunk in batch)
+                await embedded.put(
+                    (
+                        batch_num,
+                        [
+                            self._to_indexed_chunk(chunk, result.embedding)
+                            for chunk, result in zip(batch, results)
+                        ],
+                    )
                 )
-            )
 
-        # Upsert in batches
-        for i in range(0, len(indexed_chunks), self.UPSERT_BATCH_SIZE):
-            batch = indexed_chunks[i : i + self.UPSERT_BATCH_SIZE]
-            try:
-                await self._upsert_batch(batch)
-                indexed_count += len(batch)
-                logger.debug(f"Indexed batch {i // self.UPSERT_BATCH_SIZE + 1}")
-            except Exception as e:
-                failed_count += len(batch)
-                error_msg = f"Failed to upsert batch {i // self.UPSERT_BATCH_SIZE + 1}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
+        async def upload_worker() -> None:
+            nonlocal indexed_count, failed_count
+            while (item := await embedded.get()) is not None:
+                batch_num, batch = item
+                try:
+                    await self._upsert_batch(batch, wait=False)
+                    logger.debug(f"Indexed batch {batch_num}")
+                    indexed_count += len(batch)
+                except Exception as e:
+                    error_msg = f"Failed to upsert batch {batch_num}: {str(e)}"
+                    logger.error(error_msg)
+                    failed_count += len(batch)
+                    errors.append(error_msg)
+
+        # An unexpected error in any worker cancels the rest of the pipeline
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(concurrency):
+                tg.create_task(upload_worker())
+            async with asyncio.TaskGroup() as embed_tg:
+                for _ in range(embed_workers):
+                    embed_tg.create_task(embed_worker())
+            # Embedding is done; tell each upload worker to stop
+            for _ in range(concurrency):
+                await embedded.put(None)
 
         logger.info(
             f"Indexing complete: {indexed_count} indexed, {failed_count} failed"
@@ -173,22 +214,72 @@ class QdrantIndexer:
             errors=errors,
         )
 
-    async def _upsert_batch(self, chunks: list[IndexedChunk]) -> None:
+    @staticmethod
+    def _to_indexed_chunk(chunk: ContentChunk, embedding: list[float]) -> IndexedChunk:
+        """Attach an embedding and Qdrant payload to a content chunk."""
+        return IndexedChunk(
+            id=chunk.id,
+            content=chunk.content,
+            embedding=embedding,
+            metadata={
+                "chapter_id": chunk.metadata.chapter_id,
+                "title": chunk.metadata.title,
+                "section_title": chunk.metadata.section_title,
+                "page_url": chunk.metadata.page_url,
+                "position": chunk.position,
+                "token_count": chunk.token_count,
+                "content": chunk.content,  # Store content for retrieval
+            },
+        )
+
+    async def _generate_embeddings(self, texts: list[str]) -> list[EmbeddingResult]:
+        """Generate embeddings, reusing cached vectors when a cache is set.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            List of EmbeddingResult objects in the same order as input.
+        """
+        if self._embedding_cache is None:
+            return await self.embedding_service.generate_embeddings(texts)
+
+        model = self.embedding_service.model
+        cached, missing = self._embedding_cache.find_uncached_texts(model, texts)
+
+        new_results = await self.embedding_service.generate_embeddings(
+            [texts[i] for i in missing]
+        )
+        if new_results:
+            self._embedding_cache.put_many(
+                model, [(result.text, result.embedding) for result in new_results]
+            )
+
+        # Merge cached and fresh embeddings back into input order
+        results: list[EmbeddingResult | None] = [None] * len(texts)
+        for i, embedding in cached.items():
+            results[i] = EmbeddingResult(text=texts[i], embedding=embedding, token_count=0)
+        for i, result in zip(missing, new_results):
+            results[i] = result
+        return results
+
+    async def _upsert_batch(
+        self,
+        chunks: list[IndexedChunk],
+        wait: bool = True,
+    ) -> None:
         """Upsert a batch of indexed chunks to Qdrant.
 
         Args:
             chunks: List of indexed chunks with embeddings.
+            wait: Whether to wait for Qdrant to apply the batch.
         """
-        points = [
-            {
-                "id": chunk.id,
-                "vector": chunk.embedding,
-                "payload": chunk.metadata,
-            }
-            for chunk in chunks
-        ]
-
-        await self.qdrant_db.upsert_vectors(points)
+        await self.qdrant_db.upsert_batch(
+            [chunk.id for chunk in chunks],
+            [chunk.embedding for chunk in chunks],
+            [chunk.metadata for chunk in chunks],
+            wait=wait,
+        )
 
     async def index_directory(
         self,
@@ -196,6 +287,10 @@ class QdrantIndexer:
         base_url: str = "",
         chunk_size: int = 500,
         chunk_overlap: int = 50,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        embed_workers: int | None = None,
+        parse_cache_dir: Path | None = None,
     ) -> IndexingResult:
         """Index all content from a docs directory.
 
@@ -204,6 +299,10 @@ class QdrantIndexer:
             base_url: Base URL for generating page URLs.
             chunk_size: Target chunk size in tokens.
             chunk_overlap: Token overlap between chunks.
+            batch_size: Points per upsert request.
+            concurrency: Maximum concurrent upsert requests.
+            embed_workers: Maximum batches being embedded at once.
+            parse_cache_dir: Optional directory for persisting parsed content.
 
         Returns:
             IndexingResult with statistics about the operation.
@@ -216,12 +315,18 @@ class QdrantIndexer:
             base_url=base_url,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            cache_dir=parse_cache_dir,
         )
 
         logger.info(f"Parsed {len(chunks)} chunks from directory")
 
         # Index the chunks
-        return await self.index_chunks(chunks)
+        return await self.index_chunks(
+            chunks,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            embed_workers=embed_workers,
+        )
 
     async def reindex_chapter(
         self,
@@ -306,18 +411,35 @@ def get_indexer() -> QdrantIndexer:
 async def index_textbook_content(
     docs_path: str | Path,
     base_url: str = "",
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    embed_workers: int | None = None,
+    embedding_cache: EmbeddingCache | None = None,
+    parse_cache_dir: str | Path | None = None,
 ) -> IndexingResult:
     """Convenience function to index textbook content.
 
     Args:
         docs_path: Path to the docs directory.
         base_url: Base URL for generating page URLs.
+        batch_size: Points per upsert request.
+        concurrency: Maximum concurrent upsert requests.
+        embed_workers: Maximum batches being embedded at once.
+        embedding_cache: Optional persistent embedding cache.
+        parse_cache_dir: Optional directory for persisting parsed content.
 
     Returns:
         IndexingResult with statistics about the operation.
     """
-    indexer = get_indexer()
+    if embedding_cache is not None:
+        indexer = QdrantIndexer(embedding_cache=embedding_cache)
+    else:
+        indexer = get_indexer()
     return await indexer.index_directory(
         docs_path=Path(docs_path),
         base_url=base_url,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        embed_workers=embed_workers,
+        parse_cache_dir=Path(parse_cache_dir) if parse_cache_dir else None,
     )
@@ -4,12 +4,14 @@ This module provides functionality to:
 - Preprocess user queries for embedding
 - Handle query expansion for better retrieval
 - Generate query embeddings
+- Cache query embeddings for repeated and near-duplicate queries
 
 Requirements: 4.2
 """
 
 import logging
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from app.services.embedding_service import (
@@ -20,6 +22,9 @@ from app.services.embedding_service import (
 
 logger = logging.getLogger(__name__)
 
+# Punctuation stripped from queries (question marks and hyphens are kept)
+_PUNCTUATION_PATTERN = re.compile(r"[^\w\s\?\-]")
+
 
 @dataclass
 class ProcessedQuery:
@@ -31,11 +36,50 @@ class ProcessedQuery:
     embedding: list[float]
 
 
+class QueryEmbeddingCache:
+    """In-memory LRU cache of query embeddings.
+
+    Keys are the text actually sent to the embedding model, which is built
+    from the preprocessed query. Queries that differ only in case,
+    whitespace or punctuation therefore share one entry and skip the
+    embedding API round-trip.
+    """
+
+    DEFAULT_MAX_SIZE = 1024
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of embeddings kept before evicting
+                the least recently used entry.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> list[float] | None:
+        """Return the cached embedding for text, if any."""
+        embedding = self._entries.get(text)
+        if embedding is not None:
+            self._entries.move_to_end(text)
+        return embedding
+
+    def put(self, text: str, embedding: list[float]) -> None:
+        """Store an embedding, evicting the oldest entry when full."""
+        self._entries[text] = embedding
+        self._entries.move_to_end(text)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
 class QueryProcessor:
     """Service for preprocessing and embedding user queries."""
 
     # Common stop words to filter out for expansion
-    STOP_WORDS = {
+    STOP_WORDS = frozenset({
         "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
         "have", "has", "had", "do", "does", "did", "will", "would", "could",
         "should", "may", "might", "must", "shall", "can", "need", "dare",
@@ -50,40 +94,49 @@ class QueryProcessor:
         "ours", "ourselves", "you", "your", "yours", "yourself", "yourselves",
         "he", "him", "his", "himself", "she", "her", "hers", "herself", "it",
         "its", "itself", "they", "them", "their", "theirs", "themselves",
-    }
+    })
 
-    # Domain-specific synonyms for query expansion
+    # Domain-specific synonyms for query expansion (all lowercase)
     DOMAIN_SYNONYMS = {
-        "robot": ["robotics", "robotic", "humanoid"],
-        "ai": ["artificial intelligence", "machine learning", "ml"],
-        "vision": ["computer vision", "visual perception", "image processing"],
-        "motion": ["movement", "locomotion", "kinematics"],
-        "sensor": ["sensors", "perception", "sensing", "lidar", "camera", "imu"],
-        "control": ["controller", "controlling", "actuation"],
-        "learning": ["training", "machine learning", "neural network"],
-        "planning": ["path planning", "motion planning", "trajectory"],
-        "manipulation": ["grasping", "handling", "pick and place"],
-        "navigation": ["localization", "mapping", "slam", "lidar"],
-        "hri": ["human robot interaction", "human-robot interaction"],
-        "safety": ["safe", "collision avoidance", "risk"],
-        "ethics": ["ethical", "responsible ai", "fairness"],
-        "lidar": ["light detection and ranging", "laser sensor", "3d mapping", "point cloud"],
-        "map": ["mapping", "slam", "localization", "navigation"],
+        "robot": ("robotics", "robotic", "humanoid"),
+        "ai": ("artificial intelligence", "machine learning", "ml"),
+        "vision": ("computer vision", "visual perception", "image processing"),
+        "motion": ("movement", "locomotion", "kinematics"),
+        "sensor": ("sensors", "perception", "sensing", "lidar", "camera", "imu"),
+        "control": ("controller", "controlling", "actuation"),
+        "learning": ("training", "machine learning", "neural network"),
+        "planning": ("path planning", "motion planning", "trajectory"),
+        "manipulation": ("grasping", "handling", "pick and place"),
+        "navigation": ("localization", "mapping", "slam", "lidar"),
+        "hri": ("human robot interaction", "human-robot interaction"),
+        "safety": ("safe", "collision avoidance", "risk"),
+        "ethics": ("ethical", "responsible ai", "fairness"),
+        "lidar": ("light detection and ranging", "laser sensor", "3d mapping", "point cloud"),
+        "map": ("mapping", "slam", "localization", "navigation"),
     }
 
+    # Words that trigger expansion: synonym keys that are not stop words
+    EXPANSION_TRIGGERS = frozenset(DOMAIN_SYNONYMS) - STOP_WORDS
+
     def __init__(
         self,
         embedding_service: EmbeddingService | None = None,
         enable_expansion: bool = True,
+        embedding_cache: QueryEmbeddingCache | None = None,
     ):
         """Initialize query processor.
 
         Args:
             embedding_service: Embedding service instance. Uses global if not provided.
             enable_expansion: Whether to enable query expansion.
+            embedding_cache: Query embedding cache. A new one is created if
+                not provided.
         """
         self._embedding_service = embedding_service
         self.enable_expansion = enable_expansion
+        self.embedding_cache = (
+            embedding_cache if embedding_cache is not None else QueryEmbeddingCache()
+        )
 
     @property
     def embedding_service(self) -> EmbeddingService:
@@ -101,19 +154,9 @@ class QueryProcessor:
         Returns:
             Preprocessed query string.
         """
-        # Normalize whitespace
-        processed = " ".join(query.split())
-
-        # Convert to lowercase for consistency
-        processed = processed.lower()
-
-        # Remove excessive punctuation but keep question marks
-        processed = re.sub(r"[^\w\s\?\-]", " ", processed)
-
-        # Normalize whitespace again after punctuation removal
-        processed = " ".join(processed.split())
-
-        return processed
+        # Lowercase, replace punctuation (except question marks and hyphens)
+        # with spaces, then normalize whitespace in a single split/join
+        return " ".join(_PUNCTUATION_PATTERN.sub(" ", query.lower()).split())
 
     def expand_query(self, query: str) -> list[str]:
         """Expand query with domain-specific synonyms.
@@ -127,21 +170,19 @@ class QueryProcessor:
         if not self.enable_expansion:
             return []
 
-        expanded_terms = []
         query_lower = query.lower()
-        words = set(query_lower.split())
 
-        # Remove stop words from consideration
-        meaningful_words = words - self.STOP_WORDS
+        # Find synonyms for meaningful words in query order, so the
+        # expansions (and the text embedded from them) are deterministic
+        expanded_terms: dict[str, None] = {}
+        for word in dict.fromkeys(query_lower.split()):
+            if word not in self.EXPANSION_TRIGGERS:
+                continue
+            for synonym in self.DOMAIN_SYNONYMS[word]:
+                if synonym not in query_lower:
+                    expanded_terms[synonym] = None
 
-        # Find synonyms for meaningful words
-        for word in meaningful_words:
-            if word in self.DOMAIN_SYNONYMS:
-                for synonym in self.DOMAIN_SYNONYMS[word]:
-                    if synonym.lower() not in query_lower:
-                        expanded_terms.append(synonym)
-
-        return expanded_terms
+        return list(expanded_terms)
 
     def build_embedding_text(
         self,
@@ -188,21 +229,27 @@ class QueryProcessor:
         # Build text for embedding
         embedding_text = self.build_embedding_text(processed, expanded_terms)
 
-        # Generate embedding
-        embedding_result = await self.embedding_service.generate_embedding(
-            embedding_text
-        )
+        # Generate embedding, reusing a cached one for the same text
+        embedding = self.embedding_cache.get(embedding_text)
+        if embedding is None:
+            embedding_result = await self.embedding_service.generate_embedding(
+                embedding_text
+            )
+            embedding = embedding_result.embedding
+            self.embedding_cache.put(embedding_text, embedding)
+        else:
+            logger.debug("Query embedding cache hit")
 
         logger.debug(
             f"Query processed: {len(expanded_terms)} expansions, "
-            f"embedding dim: {len(embedding_result.embedding)}"
+            f"embedding dim: {len(embedding)}"
         )
 
         return ProcessedQuery(
             original_query=query,
             processed_query=processed,
             expanded_terms=expanded_terms,
-            embedding=embedding_result.embedding,
+            embedding=embedding,
         )
 
 
@@ -5,18 +5,24 @@ This module provides the main RAG pipeline that:
 - Builds context from retrieved chunks
 - Generates responses with citations
 - Handles fallback for no relevant results
+- Caches generated answers for repeated queries
+- Streams generated answers token by token
 
 Requirements: 3.1, 3.2, 3.3, 3.5
 """
 
+import hashlib
 import logging
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Any
 
 from app.services.retriever_service import VectorRetriever, get_retriever
 from app.services.response_generator import (
     ResponseGenerator,
     GeneratedResponse,
+    StreamedResponse,
     get_response_generator,
 )
 
@@ -58,19 +64,38 @@ class RAGResponse:
 class RAGService:
     """Main RAG service that orchestrates retrieval and generation."""
 
+    # Maximum number of cached answers
+    ANSWER_CACHE_SIZE = 1024
+
+    # Seconds a cached answer is reused before regenerating it
+    ANSWER_CACHE_TTL_SECONDS = 3600
+
     def __init__(
         self,
         retriever: VectorRetriever | None = None,
         response_generator: ResponseGenerator | None = None,
+        answer_cache_size: int | None = None,
+        answer_cache_ttl: float | None = None,
     ):
         """Initialize RAG service.
 
         Args:
             retriever: Vector retriever instance.
             response_generator: Response generator instance.
+            answer_cache_size: Maximum cached answers. Defaults to
+                ANSWER_CACHE_SIZE; 0 disables the cache.
+            answer_cache_ttl: Seconds an answer stays cached. Defaults to
+                ANSWER_CACHE_TTL_SECONDS.
         """
         self._retriever = retriever
         self._response_generator = response_generator
+        self._answer_cache_size = (
+            self.ANSWER_CACHE_SIZE if answer_cache_size is None else answer_cache_size
+        )
+        self._answer_cache_ttl = (
+            self.ANSWER_CACHE_TTL_SECONDS if answer_cache_ttl is None else answer_cache_ttl
+        )
+        self._answer_cache: OrderedDict[bytes, tuple[float, RAGResponse]] = OrderedDict()
 
     @property
     def retriever(self) -> VectorRetriever:
@@ -97,7 +122,15 @@ class RAGService:
         """
         logger.info(f"Processing RAG query: {request.query[:100]}...")
 
-        # Step 1: Retrieve relevant chunks
+        cache_key = self._answer_cache_key(request)
+        cached = self._get_cached_answer(cache_key)
+        if cached is not None:
+            logger.debug("RAG answer cache hit")
+            return _copy_response(cached)
+
+        # Step 1: Retrieve relevant chunks. Generation needs the retrieved
+        # chunks (or their absence, for the fallback), so the two steps are
+        # inherently sequential.
         retrieval_result = await self.retriever.retrieve(
             query=request.query,
             top_k=request.top_k,
@@ -117,13 +150,80 @@ class RAGService:
         )
 
         # Convert to RAGResponse
-        return RAGResponse(
+        response = RAGResponse(
             response=generated.response,
             sources=[s.to_dict() for s in generated.sources],
             is_fallback=generated.is_fallback,
             query=request.query,
             selected_text=request.selected_text,
         )
+        self._cache_answer(cache_key, response)
+        return response
+
+    async def process_query_stream(self, request: RAGRequest) -> StreamedResponse:
+        """Process a RAG query, streaming the generated answer.
+
+        Retrieval completes before this returns, so sources are available
+        immediately; the answer text arrives as its text_stream is iterated.
+        Streamed answers bypass the answer cache.
+
+        Args:
+            request: RAG request with query and options.
+
+        Returns:
+            StreamedResponse whose text_stream yields the answer incrementally.
+        """
+        logger.info(f"Processing streamed RAG query: {request.query[:100]}...")
+
+        retrieval_result = await self.retriever.retrieve(
+            query=request.query,
+            top_k=request.top_k,
+            score_threshold=request.score_threshold,
+        )
+
+        return await self.response_generator.generate_response_stream(
+            query=request.query,
+            retrieval_result=retrieval_result,
+            selected_text=request.selected_text,
+        )
+
+    @staticmethod
+    def _answer_cache_key(request: RAGRequest) -> bytes:
+        """Build the answer cache key from everything that shapes the answer."""
+        key = (
+            f"{request.query}\0{request.top_k}\0{request.score_threshold}\0"
+            f"{request.selected_text or ''}"
+        )
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+    def _get_cached_answer(self, key: bytes) -> RAGResponse | None:
+        """Return a cached answer that has not expired, if any."""
+        entry = self._answer_cache.get(key)
+        if entry is None:
+            return None
+
+        cached_at, response = entry
+        if time.monotonic() - cached_at > self._answer_cache_ttl:
+            del self._answer_cache[key]
+            return None
+
+        self._answer_cache.move_to_end(key)
+        return response
+
+    def _cache_answer(self, key: bytes, response: RAGResponse) -> None:
+        """Store an answer, evicting the least recently used when full."""
+        if self._answer_cache_size <= 0:
+            return
+
+        self._answer_cache[key] = (time.monotonic(), _copy_response(response))
+        self._answer_cache.move_to_end(key)
+        if len(self._answer_cache) > self._answer_cache_size:
+            self._answer_cache.popitem(last=False)
+
+
+def _copy_response(response: RAGResponse) -> RAGResponse:
+    """Copy a response so cached answers never share mutable sources."""
+    return replace(response, sources=[dict(s) for s in response.sources])
 
 
 # Global RAG service instance
@@ -5,11 +5,13 @@ This module provides functionality to:
 - Create prompt templates with citation instructions
 - Handle selected text context injection
 - Implement fallback for no relevant results
+- Stream responses token by token
 
 Requirements: 3.1, 3.2, 3.3, 3.5
 """
 
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -64,6 +66,21 @@ class GeneratedResponse:
         }
 
 
+@dataclass
+class StreamedResponse:
+    """Result of streamed response generation.
+
+    The response text is produced lazily by iterating text_stream; sources
+    and the fallback flag are known before the first token arrives.
+    """
+
+    text_stream: AsyncIterator[str]
+    sources: list[Source]
+    is_fallback: bool = False
+    query: str = ""
+    selected_text: str | None = None
+
+
 # Minimum relevance score threshold for considering results relevant
 MIN_RELEVANCE_THRESHOLD = 0.5  # Lowered from 0.7 for better recall
 
@@ -169,25 +186,21 @@ class ResponseGenerator:
         Returns:
             List of unique Source objects.
         """
-        seen_chapters: set[str] = set()
-        sources: list[Source] = []
+        # First chunk per (chapter, section) wins; dicts keep insertion order
+        sources: dict[tuple[str, str], Source] = {}
 
         for chunk in chunks:
-            # Create a unique key for deduplication
-            key = f"{chunk.chapter_id}:{chunk.section_title}"
-            if key not in seen_chapters:
-                seen_chapters.add(key)
-                sources.append(
-                    Source(
-                        chapter_id=chunk.chapter_id,
-                        title=chunk.title,
-                        section_title=chunk.section_title,
-                        page_url=chunk.page_url,
-                        relevance_score=chunk.score,
-                    )
+            key = (chunk.chapter_id, chunk.section_title)
+            if key not in sources:
+                sources[key] = Source(
+                    chapter_id=chunk.chapter_id,
+                    title=chunk.title,
+                    section_title=chunk.section_title,
+                    page_url=chunk.page_url,
+                    relevance_score=chunk.score,
                 )
 
-        return sources
+        return list(sources.values())
 
     def _has_relevant_results(self, chunks: list[RetrievedChunk]) -> bool:
         """Check if any chunks meet the relevance threshold.
@@ -198,8 +211,8 @@ class ResponseGenerator:
         Returns:
             True if at least one chunk is relevant.
         """
-        if not chunks:
-            return False
+        # any() stops at the first relevant chunk, and results arrive sorted by
+        # score, so this usually inspects a single element
         return any(chunk.score >= MIN_RELEVANCE_THRESHOLD for chunk in chunks)
 
     async def generate_response(
@@ -248,6 +261,55 @@ class ResponseGenerator:
             selected_text=selected_text,
         )
 
+    async def generate_response_stream(
+        self,
+        query: str,
+        retrieval_result: RetrievalResult,
+        selected_text: str | None = None,
+    ) -> StreamedResponse:
+        """Generate a response for a user query, streaming its text.
+
+        Args:
+            query: User's question.
+            retrieval_result: Result from vector retrieval.
+            selected_text: Optional user-selected text for context.
+
+        Returns:
+            StreamedResponse whose text_stream yields the answer incrementally.
+        """
+        chunks = retrieval_result.chunks
+
+        if not self._has_relevant_results(chunks):
+            logger.info(f"Streaming fallback response for query: {query[:100]}...")
+            return StreamedResponse(
+                text_stream=self._call_openai_stream(
+                    query=query,
+                    context=selected_text or "",
+                    is_fallback=True,
+                ),
+                sources=[],
+                is_fallback=True,
+                query=query,
+                selected_text=selected_text,
+            )
+
+        built_context = self.context_builder.build_context(
+            chunks=chunks,
+            selected_text=selected_text,
+        )
+
+        return StreamedResponse(
+            text_stream=self._call_openai_stream(
+                query=query,
+                context=built_context.context_text,
+                is_fallback=False,
+            ),
+            sources=self._extract_sources(built_context.chunks_used),
+            is_fallback=False,
+            query=query,
+            selected_text=selected_text,
+        )
+
     async def _generate_fallback_response(
         self,
         query: str,
@@ -278,13 +340,13 @@ class ResponseGenerator:
             selected_text=selected_text,
         )
 
-    async def _call_openai(
+    def _build_messages(
         self,
         query: str,
         context: str,
         is_fallback: bool,
-    ) -> str:
-        """Call OpenAI API to generate response.
+    ) -> list[dict[str, str]]:
+        """Build the chat messages for a completion request.
 
         Args:
             query: User's question.
@@ -292,7 +354,7 @@ class ResponseGenerator:
             is_fallback: Whether this is a fallback response.
 
         Returns:
-            Generated response text.
+            System and user messages.
         """
         system_prompt = FALLBACK_PROMPT if is_fallback else SYSTEM_PROMPT
 
@@ -304,13 +366,31 @@ class ResponseGenerator:
         else:
             user_message = f"{context}\n\nUser question: {query}"
 
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+
+    async def _call_openai(
+        self,
+        query: str,
+        context: str,
+        is_fallback: bool,
+    ) -> str:
+        """Call OpenAI API to generate response.
+
+        Args:
+            query: User's question.
+            context: Context from retrieved chunks.
+            is_fallback: Whether this is a fallback response.
+
+        Returns:
+            Generated response text.
+        """
         try:
             response = await self._client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
+                messages=self._build_messages(query, context, is_fallback),
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
             )
@@ -321,6 +401,39 @@ class ResponseGenerator:
             logger.error(f"OpenAI API error: {e}")
             raise
 
+    async def _call_openai_stream(
+        self,
+        query: str,
+        context: str,
+        is_fallback: bool,
+    ) -> AsyncIterator[str]:
+        """Call OpenAI API with streaming and yield response text as it arrives.
+
+        Args:
+            query: User's question.
+            context: Context from retrieved chunks.
+            is_fallback: Whether this is a fallback response.
+
+        Yields:
+            Successive pieces of the generated response text.
+        """
+        try:
+            stream = await self._client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(query, context, is_fallback),
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True,
+            )
+
+            async for chunk in stream:
+                if chunk.choices and (delta := chunk.choices[0].delta.content):
+                    yield delta
+
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+
     async def close(self) -> None:
         """Close the OpenAI client."""
         await self._client.close()
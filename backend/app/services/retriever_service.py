@@ -10,6 +10,7 @@ Requirements: 4.2
 
 import logging
 from dataclasses import dataclass
+from itertools import islice
 from typing import Any
 
 from app.db.qdrant import QdrantDatabase, get_qdrant_db
@@ -22,7 +23,7 @@ from app.services.query_processor import (
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RetrievedChunk:
     """A retrieved content chunk with metadata and score."""
 
@@ -233,22 +234,22 @@ class VectorRetriever:
         Returns:
             RetrievalResult with matching chunks from the specified chapter.
         """
+        top_k = top_k or self.default_top_k
+
         # Get all results first
         result = await self.retrieve(
             query=query,
-            top_k=(top_k or self.default_top_k) * 3,  # Get more to filter
+            top_k=top_k * 3,  # Get more to filter
             score_threshold=score_threshold,
         )
 
-        # Filter by chapter
-        filtered_chunks = [
-            chunk for chunk in result.chunks
-            if chunk.chapter_id == chapter_id
-        ]
-
-        # Limit to requested top_k
-        top_k = top_k or self.default_top_k
-        filtered_chunks = filtered_chunks[:top_k]
+        # Filter by chapter, stopping as soon as top_k matches are found
+        filtered_chunks = list(
+            islice(
+                (chunk for chunk in result.chunks if chunk.chapter_id == chapter_id),
+                top_k,
+            )
+        )
 
         return RetrievalResult(
             query=result.query,
@@ -150,10 +150,21 @@ class TechnicalTermHandler:
         "tensor": "ٹینسر",
     }
 
+    # TECHNICAL_TERMS is fixed, so the lookup and matchers are built once at
+    # import time and shared by every handler instance.
+    _TERM_LOOKUP = {k.lower(): v for k, v in TECHNICAL_TERMS.items()}
+
+    # One case-insensitive matcher per term, so overlapping terms (e.g.
+    # "robot" inside "robotics") are each reported
+    _TERM_PATTERNS = tuple(
+        (re.compile(re.escape(term), re.IGNORECASE), transliteration)
+        for term, transliteration in TECHNICAL_TERMS.items()
+    )
+
     def __init__(self):
         """Initialize technical term handler."""
         # Create case-insensitive lookup
-        self._term_lookup = {k.lower(): v for k, v in self.TECHNICAL_TERMS.items()}
+        self._term_lookup = self._TERM_LOOKUP
 
     def get_transliteration(self, term: str) -> Optional[str]:
         """Get Urdu transliteration for a technical term.
@@ -175,18 +186,15 @@ class TechnicalTermHandler:
         Returns:
             List of TechnicalTerm objects found in the content.
         """
-        terms = []
-        content_lower = content.lower()
-
-        for term, transliteration in self.TECHNICAL_TERMS.items():
-            # Find all occurrences of the term
-            pattern = re.compile(re.escape(term), re.IGNORECASE)
-            for match in pattern.finditer(content):
-                terms.append(TechnicalTerm(
-                    original=match.group(),
-                    transliteration=transliteration,
-                    position=match.start(),
-                ))
+        terms = [
+            TechnicalTerm(
+                original=match.group(),
+                transliteration=transliteration,
+                position=match.start(),
+            )
+            for pattern, transliteration in self._TERM_PATTERNS
+            for match in pattern.finditer(content)
+        ]
 
         # Sort by position
         terms.sort(key=lambda t: t.position)
@@ -361,51 +369,15 @@ class RTLFormatter:
         r'\[[^\]]+\]\([^)]+\)',  # Markdown links
     ]
 
-    def __init__(self):
-        """Initialize RTL formatter."""
-        self._ltr_pattern = re.compile('|'.join(self.LTR_PATTERNS))
+    # LTR_PATTERNS is fixed, so the matcher is compiled once at import time
+    _LTR_PATTERN = re.compile('|'.join(LTR_PATTERNS))
 
-    def apply_rtl_formatting(self, content: str) -> str:
-        """Apply RTL formatting to translated content.
-
-        Wraps the content with RTL direction markers while preserving
-        LTR formatting for code blocks and other technical content.
-
-        Args:
-            content: Translated Urdu content.
-
-        Returns:
-            Content with RTL formatting applied.
-
-        Requirements: 8.3
-        """
-        # Add RTL wrapper div
-        formatted_content = f'<div class="{self.RTL_WRAPPER_CLASS}" dir="rtl">\n\n{content}\n\n</div>'
-        return formatted_content
+    # Urdu is written in Arabic script: Arabic (0600-06FF) and
+    # Arabic Supplement (0750-077F) blocks
+    _URDU_PATTERN = re.compile(r'[\u0600-\u06FF\u0750-\u077F]')
 
-    def wrap_ltr_content(self, content: str) -> str:
-        """Wrap LTR content (code blocks, etc.) with explicit LTR markers.
-
-        Args:
-            content: Content that may contain mixed LTR/RTL sections.
-
-        Returns:
-            Content with LTR sections properly marked.
-        """
-        def wrap_match(match):
-            return f'<span dir="ltr">{match.group()}</span>'
-
-        return self._ltr_pattern.sub(wrap_match, content)
-
-    def get_rtl_css(self) -> str:
-        """Get CSS styles for RTL content.
-
-        Returns:
-            CSS string for RTL formatting.
-
-        Requirements: 8.3
-        """
-        return """
+    # Stylesheet for RTL content, shared by every formatter instance
+    RTL_CSS = """
 .rtl-content {
     direction: rtl;
     text-align: right;
@@ -466,6 +438,48 @@ class RTLFormatter:
 }
 """
 
+    def apply_rtl_formatting(self, content: str) -> str:
+        """Apply RTL formatting to translated content.
+
+        Wraps the content with RTL direction markers while preserving
+        LTR formatting for code blocks and other technical content.
+
+        Args:
+            content: Translated Urdu content.
+
+        Returns:
+            Content with RTL formatting applied.
+
+        Requirements: 8.3
+        """
+        # Add RTL wrapper div
+        formatted_content = f'<div class="{self.RTL_WRAPPER_CLASS}" dir="rtl">\n\n{content}\n\n</div>'
+        return formatted_content
+
+    def wrap_ltr_content(self, content: str) -> str:
+        """Wrap LTR content (code blocks, etc.) with explicit LTR markers.
+
+        Args:
+            content: Content that may contain mixed LTR/RTL sections.
+
+        Returns:
+            Content with LTR sections properly marked.
+        """
+        def wrap_match(match):
+            return f'<span dir="ltr">{match.group()}</span>'
+
+        return self._LTR_PATTERN.sub(wrap_match, content)
+
+    def get_rtl_css(self) -> str:
+        """Get CSS styles for RTL content.
+
+        Returns:
+            CSS string for RTL formatting.
+
+        Requirements: 8.3
+        """
+        return self.RTL_CSS
+
     def has_urdu_content(self, content: str) -> bool:
         """Check if content contains Urdu script characters.
 
@@ -477,9 +491,7 @@ class RTLFormatter:
 
         Requirements: 8.1
         """
-        # Urdu Unicode range: 0600-06FF (Arabic script used for Urdu)
-        urdu_pattern = re.compile(r'[\u0600-\u06FF]')
-        return bool(urdu_pattern.search(content))
+        return self._URDU_PATTERN.search(content) is not None
 
 
 class TranslationCache:
@@ -6,6 +6,24 @@ and indexes the content into Qdrant for RAG retrieval.
 
 Usage:
     python scripts/index_content.py --docs-path ../textbook/docs --base-url https://example.com
+
+Embedding and upload run as a pipeline: up to --embed-workers batches are
+embedded at once and handed to --upload-concurrency upload workers through
+a bounded queue, so embedding API calls overlap with Qdrant writes. Points
+are upserted in batches of --batch-size.
+
+Bulk loading is two-phase: recreate_qdrant_collection.py creates the
+collection with HNSW indexing disabled, this script uploads all points, and
+then restores the collection's indexing threshold so the graph is built once
+over the full dataset instead of incrementally per batch.
+
+Embeddings are cached on disk (backend/.cache/embeddings.db by default),
+keyed by model and chunk content, so re-running after a small docs edit
+only embeds the chunks that changed. Use --no-embedding-cache to disable.
+
+Parsed documents are likewise cached under backend/.cache/parsed, keyed by a
+hash of each file's content, so unchanged files are not re-parsed on the
+next run. Use --no-parse-cache to disable.
 """
 
 import argparse
@@ -17,9 +35,16 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Default docs location: <repo>/textbook/docs
+_DEFAULT_DOCS_PATH = Path(__file__).resolve().parent.parent.parent / "textbook" / "docs"
+
+from qdrant_client import models
+
 from app.config import get_settings
 from app.db.qdrant import init_qdrant, close_qdrant
-from app.services.indexer_service import index_textbook_content
+from app.services.content_parser import DEFAULT_PARSE_CACHE_DIR
+from app.services.embedding_cache import DEFAULT_CACHE_PATH, EmbeddingCache
+from app.services.indexer_service import QdrantIndexer, index_textbook_content
 
 # Configure logging
 logging.basicConfig(
@@ -28,13 +53,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Indexing threshold (in KB of vectors) restored after a bulk load
+INDEXING_THRESHOLD = 20000
+
+
+async def restore_indexing_threshold(client, collection_name: str) -> None:
+    """Restore the collection's HNSW indexing threshold after a bulk load.
 
-async def main(docs_path: Path, base_url: str) -> int:
+    Args:
+        client: Qdrant client.
+        collection_name: Collection to update.
+    """
+    logger.info(f"Restoring indexing threshold to {INDEXING_THRESHOLD} to trigger re-index")
+    try:
+        await client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(
+                indexing_threshold=INDEXING_THRESHOLD,
+            ),
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to restore indexing threshold on '{collection_name}': {e}. "
+            "HNSW indexing stays disabled until this script is re-run or the "
+            f"threshold is set to {INDEXING_THRESHOLD} manually."
+        )
+
+
+async def main(
+    docs_path: Path,
+    base_url: str,
+    batch_size: int = QdrantIndexer.UPSERT_BATCH_SIZE,
+    concurrency: int = QdrantIndexer.UPSERT_CONCURRENCY,
+    embed_workers: int = QdrantIndexer.EMBED_CONCURRENCY,
+    embedding_cache_path: Path | None = DEFAULT_CACHE_PATH,
+    parse_cache_dir: Path | None = DEFAULT_PARSE_CACHE_DIR,
+) -> int:
     """Main indexing function.
 
     Args:
         docs_path: Path to the docs directory.
         base_url: Base URL for generating page URLs.
+        batch_size: Points per upsert request.
+        concurrency: Maximum concurrent upsert requests.
+        embed_workers: Maximum batches being embedded at once.
+        embedding_cache_path: Path to the embedding cache database,
+            or None to embed every chunk.
+        parse_cache_dir: Directory for cached parse results,
+            or None to parse every file.
 
     Returns:
         Exit code (0 for success, 1 for failure).
@@ -50,16 +116,24 @@ async def main(docs_path: Path, base_url: str) -> int:
         logger.error(f"Docs path does not exist: {docs_path}")
         return 1
 
+    embedding_cache = EmbeddingCache(embedding_cache_path) if embedding_cache_path else None
+
+    qdrant_db = None
     try:
         # Initialize Qdrant connection
         logger.info("Connecting to Qdrant...")
-        await init_qdrant()
+        qdrant_db = await init_qdrant()
 
         # Run indexing
         logger.info(f"Indexing content from: {docs_path}")
         result = await index_textbook_content(
             docs_path=docs_path,
             base_url=base_url,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            embed_workers=embed_workers,
+            embedding_cache=embedding_cache,
+            parse_cache_dir=parse_cache_dir,
         )
 
         # Report results
@@ -75,6 +149,12 @@ async def main(docs_path: Path, base_url: str) -> int:
             for error in result.errors:
                 logger.warning(f"  - {error}")
 
+        if result.failed_chunks:
+            logger.warning(
+                f"{result.failed_chunks} chunks failed to index; "
+                "re-run this script to load them"
+            )
+
         return 0 if result.failed_chunks == 0 else 1
 
     except Exception as e:
@@ -82,8 +162,15 @@ async def main(docs_path: Path, base_url: str) -> int:
         return 1
 
     finally:
+        # Re-enable HNSW indexing even if the load failed part-way, so search
+        # is not left scanning an unindexed collection
+        if qdrant_db is not None:
+            await restore_indexing_threshold(qdrant_db.client, settings.qdrant_collection_name)
+
         # Clean up
         await close_qdrant()
+        if embedding_cache:
+            embedding_cache.close()
 
 
 def parse_args() -> argparse.Namespace:
@@ -94,7 +181,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--docs-path",
         type=Path,
-        default=Path(__file__).parent.parent.parent / "textbook" / "docs",
+        default=_DEFAULT_DOCS_PATH,
         help="Path to the textbook docs directory",
     )
     parser.add_argument(
@@ -103,10 +190,62 @@ def parse_args() -> argparse.Namespace:
         default="",
         help="Base URL for generating page URLs",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=QdrantIndexer.UPSERT_BATCH_SIZE,
+        help="Number of points per Qdrant upsert request",
+    )
+    parser.add_argument(
+        "--upload-concurrency",
+        "--concurrency",
+        dest="concurrency",
+        type=int,
+        default=QdrantIndexer.UPSERT_CONCURRENCY,
+        help="Maximum number of concurrent Qdrant upsert requests",
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=QdrantIndexer.EMBED_CONCURRENCY,
+        help="Maximum number of batches being embedded at once",
+    )
+    parser.add_argument(
+        "--embedding-cache",
+        type=Path,
+        default=DEFAULT_CACHE_PATH,
+        help="Path to the on-disk embedding cache",
+    )
+    parser.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="Embed every chunk instead of reusing cached embeddings",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        type=Path,
+        default=DEFAULT_PARSE_CACHE_DIR,
+        help="Directory for the on-disk parse cache",
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="Parse every file instead of reusing cached parse results",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    exit_code = asyncio.run(main(args.docs_path, args.base_url))
+    exit_code = asyncio.run(
+        main(
+            args.docs_path,
+            args.base_url,
+            args.batch_size,
+            args.concurrency,
+            args.embed_workers,
+            None if args.no_embedding_cache else args.embedding_cache,
+            None if args.no_parse_cache else args.parse_cache,
+        )
+    )
     sys.exit(exit_code)
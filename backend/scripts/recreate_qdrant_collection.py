@@ -6,36 +6,104 @@ This script will:
 1. Delete the existing collection (if it exists)
 2. Create a new collection with 768 dimensions (for Gemini embeddings)
 
+The collection is created with HNSW indexing disabled (indexing_threshold=0)
+so the bulk upload from index_content.py does not rebuild the graph on every
+batch. index_content.py restores the normal threshold once indexing is done,
+which triggers a single index build over the whole collection.
+
+Vectors are also stored with int8 scalar quantization, which keeps a
+quantized copy in RAM at a quarter of the float32 size. Searches rescore
+the top candidates against the original vectors (see QdrantDatabase.search),
+so recall stays close to unquantized search.
+
 Usage:
     cd backend
-    python scripts/recreate_qdrant_collection.py
+    python scripts/recreate_qdrant_collection.py [--yes]
+
+Pass --yes to skip the confirmation prompt (required when stdin is not a
+terminal, e.g. in CI). Connection settings default to the QDRANT_*
+environment variables and can be overridden on the command line.
 
 After running this script, you need to re-index your content:
     python scripts/index_content.py
 """
 
+import argparse
 import os
 import sys
+from contextlib import closing
 from pathlib import Path
 
 # Add the backend directory to the path
-backend_dir = Path(__file__).parent.parent
+backend_dir = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import (
+    Distance,
+    OptimizersConfigDiff,
+    VectorParams,
+)
+
+from app.db.qdrant import SCALAR_QUANTIZATION
 
 # Load environment variables
 load_dotenv(backend_dir / ".env")
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments, falling back to environment variables."""
+    parser = argparse.ArgumentParser(
+        description="Delete and recreate the Qdrant collection."
+    )
+    parser.add_argument(
+        "--qdrant-url",
+        default=os.getenv("QDRANT_URL"),
+        help="Qdrant URL (default: $QDRANT_URL)",
+    )
+    parser.add_argument(
+        "--qdrant-api-key",
+        default=os.getenv("QDRANT_API_KEY"),
+        help="Qdrant API key (default: $QDRANT_API_KEY)",
+    )
+    parser.add_argument(
+        "--collection-name",
+        default=os.getenv("QDRANT_COLLECTION_NAME", "textbook_content"),
+        help="Collection name (default: $QDRANT_COLLECTION_NAME or textbook_content)",
+    )
+    parser.add_argument(
+        "--vector-size",
+        type=int,
+        default=int(os.getenv("QDRANT_VECTOR_SIZE", "768")),
+        help="Vector dimensions (default: $QDRANT_VECTOR_SIZE or 768)",
+    )
+    parser.add_argument(
+        "--grpc-port",
+        type=int,
+        default=int(os.getenv("QDRANT_GRPC_PORT", "6334")),
+        help="Qdrant gRPC port (default: $QDRANT_GRPC_PORT or 6334)",
+    )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Use the REST API instead of gRPC",
+    )
+    parser.add_argument(
+        "--yes",
+        "--force",
+        action="store_true",
+        help="Delete the existing collection without prompting",
+    )
+    return parser.parse_args()
+
+
 def main():
-    # Get configuration from environment
-    qdrant_url = os.getenv("QDRANT_URL")
-    qdrant_api_key = os.getenv("QDRANT_API_KEY")
-    collection_name = os.getenv("QDRANT_COLLECTION_NAME", "textbook_content")
-    vector_size = int(os.getenv("QDRANT_VECTOR_SIZE", "768"))
+    args = parse_args()
+    qdrant_url = args.qdrant_url
+    qdrant_api_key = args.qdrant_api_key
+    collection_name = args.collection_name
+    vector_size = args.vector_size
 
     if not qdrant_url:
         print("ERROR: QDRANT_URL not set in environment")
@@ -50,52 +118,63 @@ def main():
     print(f"Vector size: {vector_size}")
     print()
 
-    # Create Qdrant client
-    client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key)
-
-    # Check if collection exists
-    collections = client.get_collections().collections
-    collection_names = [c.name for c in collections]
-
-    if collection_name in collection_names:
-        print(f"Found existing collection '{collection_name}'")
-
-        # Get collection info
-        collection_info = client.get_collection(collection_name)
-        old_vector_size = collection_info.config.params.vectors.size
-        print(f"Current vector size: {old_vector_size}")
-
-        # Confirm deletion
-        response = input(f"\nDelete collection '{collection_name}'? (yes/no): ")
-        if response.lower() != "yes":
-            print("Aborted.")
-            sys.exit(0)
-
-        # Delete the collection
-        print(f"Deleting collection '{collection_name}'...")
-        client.delete_collection(collection_name)
-        print("Collection deleted successfully!")
-    else:
-        print(f"Collection '{collection_name}' does not exist")
-
-    # Create new collection
-    print(f"\nCreating new collection '{collection_name}' with {vector_size} dimensions...")
-    client.create_collection(
-        collection_name=collection_name,
-        vectors_config=VectorParams(
-            size=vector_size,
-            distance=Distance.COSINE,
-        ),
+    # Create Qdrant client; gRPC keeps all calls on one HTTP/2 channel,
+    # which is closed once when the block exits
+    client = QdrantClient(
+        url=qdrant_url,
+        api_key=qdrant_api_key,
+        prefer_grpc=not args.http,
+        grpc_port=args.grpc_port,
     )
-    print("Collection created successfully!")
-
-    # Verify
-    collection_info = client.get_collection(collection_name)
-    print(f"\nNew collection info:")
-    print(f"  - Name: {collection_name}")
-    print(f"  - Vector size: {collection_info.config.params.vectors.size}")
-    print(f"  - Distance: {collection_info.config.params.vectors.distance}")
-    print(f"  - Points count: {collection_info.points_count}")
+    with closing(client):
+        # Check if collection exists
+        if client.collection_exists(collection_name):
+            print(f"Found existing collection '{collection_name}'")
+
+            # Get collection info
+            collection_info = client.get_collection(collection_name)
+            old_vector_size = collection_info.config.params.vectors.size
+            print(f"Current vector size: {old_vector_size}")
+
+            # Confirm deletion; only prompt when a human can answer
+            if not args.yes:
+                if not sys.stdin.isatty():
+                    print("ERROR: Refusing to delete without --yes in non-interactive mode")
+                    sys.exit(1)
+                response = input(f"\nDelete collection '{collection_name}'? (yes/no): ")
+                if response.lower() != "yes":
+                    print("Aborted.")
+                    sys.exit(0)
+
+            # Delete the collection
+            print(f"Deleting collection '{collection_name}'...")
+            client.delete_collection(collection_name)
+            print("Collection deleted successfully!")
+        else:
+            print(f"Collection '{collection_name}' does not exist")
+
+        # Create new collection
+        print(f"\nCreating new collection '{collection_name}' with {vector_size} dimensions...")
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(
+                size=vector_size,
+                distance=Distance.COSINE,
+            ),
+            # Defer HNSW indexing until index_content.py finishes the bulk load
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+            quantization_config=SCALAR_QUANTIZATION,
+        )
+        print("Collection created successfully!")
+
+        # Verify
+        collection_info = client.get_collection(collection_name)
+        print(f"\nNew collection info:")
+        print(f"  - Name: {collection_name}")
+        print(f"  - Vector size: {collection_info.config.params.vectors.size}")
+        print(f"  - Distance: {collection_info.config.params.vectors.distance}")
+        print(f"  - Quantization: {collection_info.config.quantization_config}")
+        print(f"  - Points count: {collection_info.points_count}")
 
     print("\n" + "=" * 50)
     print("SUCCESS! Collection recreated with correct dimensions.")
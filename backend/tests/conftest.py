@@ -0,0 +1,57 @@
+"""Shared test fixtures."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tests.fakes import FakeAsyncSession
+
+
+@pytest.fixture
+def fake_session():
+    """Create a fake async database session."""
+    return FakeAsyncSession()
+
+
+@pytest.fixture
+def no_pool_db(monkeypatch):
+    """Return a helper that makes a service module see a database without a pool.
+
+    Call it with the dotted path of the module whose get_postgres_db
+    should be replaced; the patch is undone after the test.
+    """
+    def patch(module: str) -> None:
+        monkeypatch.setattr(
+            f"{module}.get_postgres_db",
+            lambda: SimpleNamespace(pool=None),
+        )
+
+    return patch
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a test client shared by the whole test session.
+
+    The app is imported here rather than at module level so test runs that
+    never request a client skip building the FastAPI application.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+async def aclient():
+    """Create an async client that calls the app in the test event loop."""
+    import httpx
+
+    from app.main import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+    ) as client:
+        yield client
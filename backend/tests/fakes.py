@@ -0,0 +1,40 @@
+"""Lightweight fakes shared by the test modules."""
+
+
+class FakeAsyncSession:
+    """Minimal stand-in for an SQLAlchemy AsyncSession.
+
+    Records added objects and whether a rollback happened, and can be told
+    to raise on commit to exercise error handling.
+    """
+
+    def __init__(self, commit_raises: Exception | None = None):
+        self.added: list = []
+        self.committed = False
+        self.rolled_back = False
+        self._commit_raises = commit_raises
+
+    def add(self, obj) -> None:
+        self.added.append(obj)
+
+    async def commit(self) -> None:
+        if self._commit_raises:
+            raise self._commit_raises
+        self.committed = True
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+
+class FakeAsyncOpenAI:
+    """Inert stand-in for openai.AsyncOpenAI.
+
+    Accepts any constructor arguments so services can build their client
+    without a real API key; tests attach whatever client behaviour they need.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def close(self) -> None:
+        pass
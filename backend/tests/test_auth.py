@@ -20,12 +20,27 @@ from app.services.auth_service import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    """Create test client."""
+    """Create test client shared across the module."""
     return TestClient(app)
 
 
+@pytest.fixture(scope="module")
+def auth_service():
+    """Create an auth service with a low bcrypt cost factor."""
+    return AuthService(rounds=4)
+
+
+@pytest.fixture(scope="class")
+def fast_auth():
+    """Stub out bcrypt so endpoint tests never pay for key derivation."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(AuthService, "hash_password", lambda self, password: "$2b$04$fakefakefake")
+        mp.setattr(AuthService, "verify_password", lambda self, plain, hashed: False)
+        yield
+
+
 @pytest.fixture
 def mock_db_pool():
     """Create a mock database pool."""
@@ -39,14 +54,14 @@ class TestPasswordHashing:
     def test_password_hash_is_different_from_plain(self):
         """Password hash should be different from plain password."""
         password = "test_password_123"
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=4)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         assert hashed.decode('utf-8') != password
 
     def test_password_verification_works(self):
         """Password verification should work correctly."""
         password = "test_password_123"
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=4)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         assert bcrypt.checkpw(password.encode('utf-8'), hashed) is True
 
@@ -54,7 +69,7 @@ class TestPasswordHashing:
         """Wrong password should fail verification."""
         password = "test_password_123"
         wrong_password = "wrong_password"
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=4)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         assert bcrypt.checkpw(wrong_password.encode('utf-8'), hashed) is False
 
@@ -62,9 +77,8 @@ class TestPasswordHashing:
 class TestAuthService:
     """Test AuthService methods."""
 
-    def test_create_access_token(self):
+    def test_create_access_token(self, auth_service):
         """Test JWT token creation."""
-        auth_service = AuthService()
         user_id = str(uuid.uuid4())
 
         token, expires_at = auth_service.create_access_token(user_id)
@@ -74,9 +88,8 @@ class TestAuthService:
         assert len(token) > 0
         assert expires_at > datetime.now(timezone.utc)
 
-    def test_decode_valid_token(self):
+    def test_decode_valid_token(self, auth_service):
         """Test decoding a valid JWT token."""
-        auth_service = AuthService()
         user_id = str(uuid.uuid4())
 
         token, _ = auth_service.create_access_token(user_id)
@@ -85,17 +98,14 @@ class TestAuthService:
         assert payload is not None
         assert payload["sub"] == user_id
 
-    def test_decode_invalid_token(self):
+    def test_decode_invalid_token(self, auth_service):
         """Test decoding an invalid token returns None."""
-        auth_service = AuthService()
-
         payload = auth_service.decode_token("invalid_token")
 
         assert payload is None
 
-    def test_hash_password(self):
+    def test_hash_password(self, auth_service):
         """Test password hashing."""
-        auth_service = AuthService()
         password = "secure_password_123"
 
         hashed = auth_service.hash_password(password)
@@ -103,23 +113,29 @@ class TestAuthService:
         assert hashed != password
         assert auth_service.verify_password(password, hashed) is True
 
-    def test_verify_password_correct(self):
+    def test_verify_password_correct(self, auth_service):
         """Test password verification with correct password."""
-        auth_service = AuthService()
         password = "secure_password_123"
         hashed = auth_service.hash_password(password)
 
         assert auth_service.verify_password(password, hashed) is True
 
-    def test_verify_password_incorrect(self):
+    def test_verify_password_incorrect(self, auth_service):
         """Test password verification with incorrect password."""
-        auth_service = AuthService()
         password = "secure_password_123"
         wrong_password = "wrong_password"
         hashed = auth_service.hash_password(password)
 
         assert auth_service.verify_password(wrong_password, hashed) is False
 
+    def test_hash_password_uses_configured_rounds(self):
+        """Test that the bcrypt cost factor is taken from the rounds argument."""
+        auth_service = AuthService(rounds=5)
+
+        hashed = auth_service.hash_password("secure_password_123")
+
+        assert hashed.startswith("$2b$05$")
+
 
 class TestUserModels:
     """Test Pydantic models for authentication."""
@@ -184,6 +200,7 @@ class TestUserModels:
         assert login_data.password == "password123"
 
 
+@pytest.mark.usefixtures("fast_auth")
 class TestAuthEndpoints:
     """Test authentication API endpoints."""
 
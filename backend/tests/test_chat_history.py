@@ -5,22 +5,17 @@ Requirements: 5.1
 
 import pytest
 import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.routers.chat import store_chat_message, ChatRequest, ChatResponse
+from tests.fakes import FakeAsyncSession
 
 
 class TestChatHistoryStorage:
     """Tests for chat history storage."""
 
     @pytest.mark.asyncio
-    async def test_store_chat_message_success(self):
+    async def test_store_chat_message_success(self, fake_session):
         """Test storing chat message with valid data."""
-        # Create mock session
-        mock_session = AsyncMock()
-        mock_session.add = MagicMock()
-        mock_session.commit = AsyncMock()
-
         # Test data
         query = "What is Physical AI?"
         response = "Physical AI refers to AI systems that interact with the physical world."
@@ -30,7 +25,7 @@ class TestChatHistoryStorage:
 
         # Call the function
         await store_chat_message(
-            session=mock_session,
+            session=fake_session,
             query=query,
             response=response,
             sources=sources,
@@ -38,12 +33,12 @@ class TestChatHistoryStorage:
             user_id=user_id,
         )
 
-        # Verify session.add was called
-        mock_session.add.assert_called_once()
-        mock_session.commit.assert_called_once()
+        # Verify the message was added and committed
+        assert len(fake_session.added) == 1
+        assert fake_session.committed
 
         # Verify the ChatMessage was created with correct data
-        added_message = mock_session.add.call_args[0][0]
+        added_message = fake_session.added[0]
         assert added_message.query == query
         assert added_message.response == response
         assert added_message.sources == sources
@@ -51,14 +46,10 @@ class TestChatHistoryStorage:
         assert added_message.user_id == uuid.UUID(user_id)
 
     @pytest.mark.asyncio
-    async def test_store_chat_message_without_user_id(self):
+    async def test_store_chat_message_without_user_id(self, fake_session):
         """Test storing chat message without user_id (anonymous user)."""
-        mock_session = AsyncMock()
-        mock_session.add = MagicMock()
-        mock_session.commit = AsyncMock()
-
         await store_chat_message(
-            session=mock_session,
+            session=fake_session,
             query="Test query",
             response="Test response",
             sources=[],
@@ -66,9 +57,8 @@ class TestChatHistoryStorage:
             user_id=None,
         )
 
-        mock_session.add.assert_called_once()
-        added_message = mock_session.add.call_args[0][0]
-        assert added_message.user_id is None
+        assert len(fake_session.added) == 1
+        assert fake_session.added[0].user_id is None
 
     @pytest.mark.asyncio
     async def test_store_chat_message_no_session(self):
@@ -87,14 +77,11 @@ class TestChatHistoryStorage:
     @pytest.mark.asyncio
     async def test_store_chat_message_handles_db_error(self):
         """Test that database errors are handled gracefully."""
-        mock_session = AsyncMock()
-        mock_session.add = MagicMock()
-        mock_session.commit = AsyncMock(side_effect=Exception("DB Error"))
-        mock_session.rollback = AsyncMock()
+        session = FakeAsyncSession(commit_raises=Exception("DB Error"))
 
         # Should not raise - errors are logged but not propagated
         await store_chat_message(
-            session=mock_session,
+            session=session,
             query="Test query",
             response="Test response",
             sources=[],
@@ -103,7 +90,7 @@ class TestChatHistoryStorage:
         )
 
         # Verify rollback was called
-        mock_session.rollback.assert_called_once()
+        assert session.rolled_back
 
 
 class TestChatRequestValidation:
@@ -3,12 +3,14 @@
 import pytest
 from pathlib import Path
 
+import app.services.content_parser as content_parser_module
 from app.services.content_parser import (
     ContentParser,
     ContentChunker,
     ContentMetadata,
     ParsedContent,
     ContentChunk,
+    parse_textbook_directory,
 )
 
 
@@ -120,6 +122,29 @@ This is a tip.
 
         assert "Important" in result.text_content or "tip" in result.text_content.lower()
 
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            (":::tip\n\n```python\nprint(1)\n```\n\n:::", "Tip: [Code example in python]: print(1)"),
+            (":::tip Important\n```python\nprint(1)\n```\n:::", "Important: [Code example in python]: print(1)"),
+            (":::note\n```mermaid\nA --> B\n```\n:::", "Note: [Diagram]"),
+            (":::note Flow\n```mermaid\nA --> B\n```\n:::", "Flow: [Diagram]"),
+        ],
+    )
+    def test_admonition_with_nested_fence(self, parser, content, expected):
+        """Test that fenced blocks inside admonitions are summarised, not leaked."""
+        result = parser.parse_content(content, Path("docs/test.md"))
+
+        assert result.text_content == expected
+        assert "```" not in result.text_content
+
+    def test_admonition_title_with_inline_code(self, parser):
+        """Test that inline code in an admonition title is kept."""
+        content = ":::tip Use `ros2 run` here\nBody\n:::"
+        result = parser.parse_content(content, Path("docs/test.md"))
+
+        assert result.text_content == "Use `ros2 run` here: Body"
+
     def test_extract_sections(self, parser):
         """Test section extraction from content."""
         content = """# Main Title
@@ -141,6 +166,63 @@ Section two content.
         section_titles = [s[0] for s in result.sections]
         assert "Section One" in section_titles or "Main Title" in section_titles
 
+    def test_parse_file_reuses_result_for_unchanged_file(self, parser, tmp_path):
+        """Test that parsing an unchanged file returns the cached result."""
+        file_path = tmp_path / "docs" / "cached.md"
+        file_path.parent.mkdir()
+        file_path.write_text("# Cached\n\nOriginal text.", encoding="utf-8")
+
+        first = parser.parse_file(file_path)
+        second = parser.parse_file(file_path)
+
+        assert second == first
+        assert content_parser_module._parse_file_cached.cache_info().hits >= 1
+
+    def test_parse_file_returns_independent_copies(self, parser, tmp_path):
+        """Test that mutating a parse result does not affect later calls."""
+        file_path = tmp_path / "docs" / "copied.md"
+        file_path.parent.mkdir()
+        file_path.write_text("# Copied\n\nOriginal text.", encoding="utf-8")
+
+        first = parser.parse_file(file_path)
+        expected_sections = list(first.sections)
+        first.sections.append(("Injected", "text"))
+        first.metadata.title = "Changed"
+        second = parser.parse_file(file_path)
+
+        assert second.sections == expected_sections
+        assert second.metadata.title != "Changed"
+
+    def test_parse_file_reparses_modified_file(self, parser, tmp_path):
+        """Test that a modified file is parsed again."""
+        file_path = tmp_path / "docs" / "modified.md"
+        file_path.parent.mkdir()
+        file_path.write_text("# Modified\n\nOriginal text.", encoding="utf-8")
+        first = parser.parse_file(file_path)
+
+        file_path.write_text("# Modified\n\nUpdated text, now longer.", encoding="utf-8")
+        second = parser.parse_file(file_path)
+
+        assert "Original text" in first.text_content
+        assert "Updated text" in second.text_content
+
+    def test_parse_content_uses_disk_cache(self, tmp_path, monkeypatch):
+        """Test that content parsed once is loaded from the disk cache."""
+        cache_dir = tmp_path / "parsed"
+        file_path = Path("docs/cached.md")
+        content = "# Cached\n\nSome text."
+
+        first = ContentParser(cache_dir=cache_dir).parse_content(content, file_path)
+        assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("content should not be re-parsed")
+
+        monkeypatch.setattr(ContentParser, "_parse_content", fail)
+        second = ContentParser(cache_dir=cache_dir).parse_content(content, file_path)
+
+        assert second == first
+
 
 class TestContentChunker:
     """Tests for ContentChunker class."""
@@ -264,3 +346,37 @@ class TestContentChunker:
 
         chunks = chunker.chunk_content(parsed)
         assert len(chunks) > 1
+
+
+class TestParseTextbookDirectory:
+    """Tests for parse_textbook_directory function."""
+
+    @pytest.fixture
+    def docs_path(self, tmp_path):
+        """Create a small docs tree."""
+        docs = tmp_path / "docs"
+        for name in ["alpha", "beta", "gamma"]:
+            chapter = docs / name
+            chapter.mkdir(parents=True)
+            body = " ".join([f"This sentence belongs to the {name} chapter."] * 40)
+            (chapter / f"{name}.mdx").write_text(f"# {name.title()}\n\n{body}\n", encoding="utf-8")
+        templates = docs / "_templates"
+        templates.mkdir()
+        (templates / "template.mdx").write_text("# Template\n\nIgnored.\n", encoding="utf-8")
+        return docs
+
+    def test_skips_templates(self, docs_path):
+        """Test that template files are not indexed."""
+        chunks = parse_textbook_directory(docs_path, max_workers=1)
+
+        chapter_ids = {c.metadata.chapter_id for c in chunks}
+        assert chapter_ids == {"alpha", "beta", "gamma"}
+
+    def test_process_pool_matches_serial(self, docs_path, monkeypatch):
+        """Test that parallel parsing returns the same chunks as serial parsing."""
+        serial = parse_textbook_directory(docs_path, max_workers=1)
+
+        monkeypatch.setattr(content_parser_module, "PARALLEL_PARSE_MIN_FILES", 1)
+        parallel = parse_textbook_directory(docs_path, max_workers=2)
+
+        assert [c.to_dict() for c in parallel] == [c.to_dict() for c in serial]
@@ -0,0 +1,208 @@
+"""Tests for the Qdrant content indexer.
+
+Requirements: 4.1, 4.3
+"""
+
+import sqlite3
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.content_parser import ContentChunk, ContentMetadata
+from app.services.embedding_cache import EMBEDDING_CACHE_VERSION, EmbeddingCache
+from app.services.embedding_service import EmbeddingResult
+from app.services.indexer_service import QdrantIndexer
+
+
+def create_chunk(position: int, chapter_id: str = "test-chapter") -> ContentChunk:
+    """Helper to create a content chunk."""
+    return ContentChunk(
+        id=f"chunk-{position}",
+        content=f"Chunk content {position}",
+        metadata=ContentMetadata(
+            chapter_id=chapter_id,
+            title="Test Chapter",
+            section_title="Section",
+            page_url=f"/{chapter_id}",
+        ),
+        position=position,
+        token_count=10,
+    )
+
+
+@pytest.fixture
+def mock_embedding_service():
+    """Create a mock embedding service returning one vector per text."""
+    service = MagicMock()
+    service.model = "test-embedding-model"
+
+    async def generate_embeddings(texts):
+        return [
+            EmbeddingResult(text=text, embedding=[0.1, 0.2], token_count=1)
+            for text in texts
+        ]
+
+    service.generate_embeddings = AsyncMock(side_effect=generate_embeddings)
+    return service
+
+
+@pytest.fixture
+def mock_qdrant_db():
+    """Create a mock Qdrant database."""
+    db = MagicMock()
+    db.upsert_batch = AsyncMock()
+    return db
+
+
+class TestQdrantIndexer:
+    """Tests for QdrantIndexer class."""
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_empty(self, mock_qdrant_db, mock_embedding_service):
+        """Test indexing no chunks returns an empty result."""
+        indexer = QdrantIndexer(mock_qdrant_db, mock_embedding_service)
+
+        result = await indexer.index_chunks([])
+
+        assert result.total_chunks == 0
+        mock_qdrant_db.upsert_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_splits_into_batches(self, mock_qdrant_db, mock_embedding_service):
+        """Test chunks are upserted in batches of the requested size."""
+        indexer = QdrantIndexer(mock_qdrant_db, mock_embedding_service)
+        chunks = [create_chunk(i) for i in range(10)]
+
+        result = await indexer.index_chunks(chunks, batch_size=4, concurrency=2)
+
+        assert result.indexed_chunks == 10
+        assert result.failed_chunks == 0
+        assert result.chapters_processed == ["test-chapter"]
+        batch_sizes = [len(c.args[0]) for c in mock_qdrant_db.upsert_batch.call_args_list]
+        assert sorted(batch_sizes) == [2, 4, 4]
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_counts_failed_batches(self, mock_qdrant_db, mock_embedding_service):
+        """Test a failing batch is reported without aborting the others."""
+        mock_qdrant_db.upsert_batch = AsyncMock(
+            side_effect=[None, Exception("Upsert failed"), None]
+        )
+        indexer = QdrantIndexer(mock_qdrant_db, mock_embedding_service)
+        chunks = [create_chunk(i) for i in range(6)]
+
+        result = await indexer.index_chunks(chunks, batch_size=2, concurrency=1)
+
+        assert result.indexed_chunks == 4
+        assert result.failed_chunks == 2
+        assert len(result.errors) == 1
+        assert "Upsert failed" in result.errors[0]
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_counts_failed_embedding_batches(self, mock_qdrant_db, mock_embedding_service):
+        """Test an embedding failure only fails its own batch."""
+        embed = mock_embedding_service.generate_embeddings.side_effect
+
+        async def generate_embeddings(texts):
+            if "Chunk content 0" in texts:
+                raise Exception("Embedding API error")
+            return await embed(texts)
+
+        mock_embedding_service.generate_embeddings = AsyncMock(side_effect=generate_embeddings)
+        indexer = QdrantIndexer(mock_qdrant_db, mock_embedding_service)
+        chunks = [create_chunk(i) for i in range(6)]
+
+        result = await indexer.index_chunks(chunks, batch_size=2, embed_workers=2)
+
+        assert result.indexed_chunks == 4
+        assert result.failed_chunks == 2
+        assert mock_qdrant_db.upsert_batch.call_count == 2
+        assert "Embedding API error" in result.errors[0]
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_only_embeds_uncached(self, mock_qdrant_db, mock_embedding_service, tmp_path):
+        """Test that cached chunks are not sent to the embedding service."""
+        cache = EmbeddingCache(tmp_path / "embeddings.db")
+        indexer = QdrantIndexer(mock_qdrant_db, mock_embedding_service, embedding_cache=cache)
+        chunks = [create_chunk(i) for i in range(3)]
+
+        await indexer.index_chunks(chunks[:2])
+        result = await indexer.index_chunks(chunks)
+
+        assert result.indexed_chunks == 3
+        last_call = mock_embedding_service.generate_embeddings.call_args_list[-1]
+        assert last_call.args[0] == ["Chunk content 2"]
+        cache.close()
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache in a temporary directory."""
+        cache = EmbeddingCache(tmp_path / "embeddings.db")
+        yield cache
+        cache.close()
+
+    def test_round_trip(self, cache):
+        """Test stored embeddings can be read back."""
+        cache.put_many("model", [("hello", [0.5, -0.25])])
+
+        assert cache.get_many("model", ["hello", "missing"]) == [[0.5, -0.25], None]
+
+    def test_key_includes_model(self, cache):
+        """Test that the same text under another model is a miss."""
+        cache.put_many("model-a", [("hello", [0.5])])
+
+        assert cache.get_many("model-b", ["hello"]) == [None]
+
+    def test_whitespace_edits_hit(self, cache):
+        """Test that reflowed text reuses the cached embedding."""
+        cache.put_many("model", [("Hello  world\nagain", [0.5])])
+
+        assert cache.get_many("model", ["Hello world again", "Hello world!"]) == [[0.5], None]
+
+    def test_case_edits_miss(self, cache):
+        """Test that texts differing only in case are embedded separately."""
+        cache.put_many("model", [("ROS nodes", [0.5])])
+
+        assert cache.get_many("model", ["ros nodes", "ROS  nodes"]) == [None, [0.5]]
+
+    def test_reopen_keeps_entries(self, tmp_path):
+        """Test that a cache written with the current version is reused."""
+        path = tmp_path / "embeddings.db"
+        cache = EmbeddingCache(path)
+        cache.put_many("model", [("hello", [0.5])])
+        cache.close()
+
+        reopened = EmbeddingCache(path)
+        try:
+            assert reopened.get_many("model", ["hello"]) == [[0.5]]
+        finally:
+            reopened.close()
+
+    def test_stale_version_is_cleared(self, tmp_path):
+        """Test that a cache from another version is emptied on open."""
+        path = tmp_path / "embeddings.db"
+        cache = EmbeddingCache(path)
+        cache.put_many("model", [("hello", [0.5])])
+        cache.close()
+
+        conn = sqlite3.connect(path)
+        conn.execute(f"PRAGMA user_version = {EMBEDDING_CACHE_VERSION - 1}")
+        conn.close()
+
+        reopened = EmbeddingCache(path)
+        try:
+            assert reopened.get_many("model", ["hello"]) == [None]
+        finally:
+            reopened.close()
+
+    def test_find_uncached_texts(self, cache):
+        """Test partitioning texts into cached and missing entries."""
+        cache.put_many("model", [("b", [1.0])])
+
+        cached, missing = cache.find_uncached_texts("model", ["a", "b", "c"])
+
+        assert cached == {1: [1.0]}
+        assert missing == [0, 2]
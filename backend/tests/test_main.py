@@ -1,22 +1,16 @@
 """Tests for main application."""
 
 import pytest
-from unittest.mock import AsyncMock, patch
-from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
 
-from app.main import app
+from app.main import app, log_requests
 from app.services.rag_service import RAGResponse
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_rag_response():
-    """Create a mock RAG response."""
+    """Create a mock RAG response shared across tests; treat it as read-only."""
     return RAGResponse(
         response="Physical AI refers to AI systems that interact with the physical world.",
         sources=[
@@ -57,19 +51,21 @@ def test_readiness_check(client):
     assert response.json() == {"status": "ready"}
 
 
-def test_chat_endpoint_with_rag(mock_rag_response):
+def test_chat_endpoint_with_rag(client, mock_rag_response):
     """Test chat endpoint returns response from RAG pipeline."""
     from app.services.rag_service import get_rag_service
 
-    # Create mock RAG service
-    mock_service = AsyncMock()
-    mock_service.process_query = AsyncMock(return_value=mock_rag_response)
+    # Stub RAG service returning the canned response
+    class _StubRAG:
+        async def process_query(self, *args, **kwargs):
+            return mock_rag_response
+
+    mock_service = _StubRAG()
 
     # Override the dependency
     app.dependency_overrides[get_rag_service] = lambda: mock_service
 
     try:
-        client = TestClient(app)
         response = client.post(
             "/api/chat",
             json={"query": "What is Physical AI?"},
@@ -85,26 +81,73 @@ def test_chat_endpoint_with_rag(mock_rag_response):
         assert data["sources"][0]["chapter_id"] == "intro"
     finally:
         # Clean up the override
-        app.dependency_overrides.clear()
+        app.dependency_overrides.pop(get_rag_service, None)
 
 
-def test_cors_headers(client):
-    """Test CORS headers are present in response."""
-    response = client.options(
-        "/",
-        headers={
-            "Origin": "http://localhost:3000",
-            "Access-Control-Request-Method": "GET",
-        },
-    )
-    # CORS preflight should succeed
-    assert response.status_code == 200
+def test_chat_stream_endpoint(client):
+    """Test streaming chat endpoint emits sources, tokens and a done event."""
+    import json
 
+    from app.services.rag_service import get_rag_service
+    from app.services.response_generator import Source, StreamedResponse
+
+    async def _tokens():
+        yield "Physical AI "
+        yield "acts in the world."
+
+    class _StubRAG:
+        async def process_query_stream(self, *args, **kwargs):
+            return StreamedResponse(
+                text_stream=_tokens(),
+                sources=[
+                    Source(
+                        chapter_id="intro",
+                        title="Introduction",
+                        section_title="Introduction to Physical AI",
+                        page_url="/docs/intro",
+                        relevance_score=0.95,
+                    )
+                ],
+                query="What is Physical AI?",
+            )
+
+    app.dependency_overrides[get_rag_service] = lambda: _StubRAG()
 
-def test_process_time_header(client):
-    """Test X-Process-Time header is added to responses."""
-    response = client.get("/")
-    assert "X-Process-Time" in response.headers
+    try:
+        response = client.post(
+            "/api/chat/stream",
+            json={"query": "What is Physical AI?"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events[0]["type"] == "sources"
+        assert events[0]["sources"][0]["chapter_id"] == "intro"
+        assert events[0]["is_fallback"] is False
+        assert [e["content"] for e in events if e["type"] == "token"] == [
+            "Physical AI ",
+            "acts in the world.",
+        ]
+        assert events[-1] == {"type": "done"}
+    finally:
+        app.dependency_overrides.pop(get_rag_service, None)
+
+
+def test_cors_headers():
+    """Test CORS middleware is installed and allows the frontend origin."""
+    cors = [mw for mw in app.user_middleware if mw.cls is CORSMiddleware]
+
+    assert len(cors) == 1
+    assert "http://localhost:3000" in cors[0].kwargs["allow_origins"]
+
+
+def test_process_time_header():
+    """Test the request logging middleware that adds X-Process-Time is installed."""
+    assert any(
+        mw.cls is BaseHTTPMiddleware and mw.kwargs.get("dispatch") is log_requests
+        for mw in app.user_middleware
+    )
 
 
 def test_chat_endpoint_validation_error(client):
@@ -4,11 +4,8 @@ Requirements: 7.1, 7.2, 7.3, 7.4
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, patch, MagicMock
-import uuid
+from types import SimpleNamespace
 
-from app.main import app
 from app.services.personalization_service import (
     ProfileAnalyzer,
     ContentAdapter,
@@ -20,38 +17,100 @@ from app.services.personalization_service import (
     PersonalizedContentRequest,
     PersonalizedContentResponse,
 )
+from tests.fakes import FakeAsyncOpenAI
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
+# Fixed user ID for tests that never inspect its value
+_UID = "00000000-0000-0000-0000-000000000001"
 
+# Adaptation prompts lowercased once for case-insensitive assertions
+_LC = {level: prompt.lower() for level, prompt in ContentAdapter.ADAPTATION_PROMPTS.items()}
 
-@pytest.fixture
+
+class _StubAdapter(ContentAdapter):
+    """ContentAdapter subclass used where only identity matters."""
+
+
+def _stub_adapter() -> ContentAdapter:
+    """Create a ContentAdapter without running __init__ (no OpenAI client)."""
+    return _StubAdapter.__new__(_StubAdapter)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patch_async_openai():
+    """Keep ContentAdapter from building a real OpenAI client in this module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.services.personalization_service.AsyncOpenAI", FakeAsyncOpenAI)
+        yield
+
+
+@pytest.fixture(scope="module")
 def profile_analyzer():
-    """Create ProfileAnalyzer instance."""
+    """Create ProfileAnalyzer instance; it is stateless, so one per module."""
     return ProfileAnalyzer()
 
 
+@pytest.fixture(scope="module")
+def beginner_profile():
+    """Create a profile with no prior experience."""
+    return UserProfile(
+        user_id=_UID,
+        software_experience="beginner",
+        hardware_experience="beginner",
+        programming_languages=[],
+        robotics_experience=False,
+        ai_experience=False,
+    )
+
+
+@pytest.fixture(scope="module")
+def intermediate_profile():
+    """Create a profile with intermediate experience and AI background."""
+    return UserProfile(
+        user_id="00000000-0000-0000-0000-000000000002",
+        software_experience="intermediate",
+        hardware_experience="intermediate",
+        programming_languages=["Python", "JavaScript"],
+        robotics_experience=False,
+        ai_experience=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def advanced_profile():
+    """Create a profile with advanced experience in every area."""
+    return UserProfile(
+        user_id="00000000-0000-0000-0000-000000000003",
+        software_experience="advanced",
+        hardware_experience="advanced",
+        programming_languages=["Python", "C++", "Rust", "JavaScript", "Go"],
+        robotics_experience=True,
+        ai_experience=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def incomplete_profile():
+    """Create a profile with no background information filled in."""
+    return UserProfile(
+        user_id="00000000-0000-0000-0000-000000000004",
+        software_experience=None,
+        hardware_experience=None,
+        programming_languages=None,
+        robotics_experience=False,
+        ai_experience=False,
+    )
+
+
 class TestProfileAnalyzer:
     """Test ProfileAnalyzer functionality.
 
     Requirements: 7.1
     """
 
-    def test_analyze_beginner_profile(self, profile_analyzer):
+    def test_analyze_beginner_profile(self, profile_analyzer, beginner_profile):
         """Test analysis of beginner profile."""
-        profile = UserProfile(
-            user_id=str(uuid.uuid4()),
-            software_experience="beginner",
-            hardware_experience="beginner",
-            programming_languages=[],
-            robotics_experience=False,
-            ai_experience=False,
-        )
-
-        result = profile_analyzer.analyze_profile(profile)
+        result = profile_analyzer.analyze_profile(beginner_profile)
 
         assert result.experience_level == ExperienceLevel.BEGINNER
         assert result.has_complete_profile is True
@@ -59,18 +118,9 @@ class TestProfileAnalyzer:
         assert result.hardware_score == 0
         assert result.domain_score == 0
 
-    def test_analyze_intermediate_profile(self, profile_analyzer):
+    def test_analyze_intermediate_profile(self, profile_analyzer, intermediate_profile):
         """Test analysis of intermediate profile."""
-        profile = UserProfile(
-            user_id=str(uuid.uuid4()),
-            software_experience="intermediate",
-            hardware_experience="intermediate",
-            programming_languages=["Python", "JavaScript"],
-            robotics_experience=False,
-            ai_experience=True,
-        )
-
-        result = profile_analyzer.analyze_profile(profile)
+        result = profile_analyzer.analyze_profile(intermediate_profile)
 
         assert result.experience_level == ExperienceLevel.INTERMEDIATE
         assert result.has_complete_profile is True
@@ -78,18 +128,9 @@ class TestProfileAnalyzer:
         assert result.hardware_score == 1
         assert result.domain_score == 1  # AI experience only
 
-    def test_analyze_advanced_profile(self, profile_analyzer):
+    def test_analyze_advanced_profile(self, profile_analyzer, advanced_profile):
         """Test analysis of advanced profile."""
-        profile = UserProfile(
-            user_id=str(uuid.uuid4()),
-            software_experience="advanced",
-            hardware_experience="advanced",
-            programming_languages=["Python", "C++", "Rust", "JavaScript", "Go"],
-            robotics_experience=True,
-            ai_experience=True,
-        )
-
-        result = profile_analyzer.analyze_profile(profile)
+        result = profile_analyzer.analyze_profile(advanced_profile)
 
         assert result.experience_level == ExperienceLevel.ADVANCED
         assert result.has_complete_profile is True
@@ -97,21 +138,12 @@ class TestProfileAnalyzer:
         assert result.hardware_score == 2
         assert result.domain_score == 2  # Both robotics and AI
 
-    def test_incomplete_profile_detection(self, profile_analyzer):
+    def test_incomplete_profile_detection(self, profile_analyzer, incomplete_profile):
         """Test detection of incomplete profile.
 
         Requirements: 7.3
         """
-        profile = UserProfile(
-            user_id=str(uuid.uuid4()),
-            software_experience=None,
-            hardware_experience=None,
-            programming_languages=None,
-            robotics_experience=False,
-            ai_experience=False,
-        )
-
-        result = profile_analyzer.analyze_profile(profile)
+        result = profile_analyzer.analyze_profile(incomplete_profile)
 
         assert result.has_complete_profile is False
         assert result.experience_level == ExperienceLevel.BEGINNER  # Default
@@ -119,7 +151,7 @@ class TestProfileAnalyzer:
     def test_partial_profile_is_complete(self, profile_analyzer):
         """Test that partial profile with some data is considered complete."""
         profile = UserProfile(
-            user_id=str(uuid.uuid4()),
+            user_id=_UID,
             software_experience="intermediate",
             hardware_experience=None,
             programming_languages=None,
@@ -135,7 +167,7 @@ class TestProfileAnalyzer:
         """Test that programming languages add bonus to score."""
         # Profile with many languages
         profile_many_langs = UserProfile(
-            user_id=str(uuid.uuid4()),
+            user_id=_UID,
             software_experience="intermediate",
             hardware_experience="intermediate",
             programming_languages=["Python", "JavaScript", "C++", "Rust", "Go"],
@@ -145,7 +177,7 @@ class TestProfileAnalyzer:
 
         # Profile with few languages
         profile_few_langs = UserProfile(
-            user_id=str(uuid.uuid4()),
+            user_id=_UID,
             software_experience="intermediate",
             hardware_experience="intermediate",
             programming_languages=["Python"],
@@ -162,7 +194,7 @@ class TestProfileAnalyzer:
     def test_reasoning_generation(self, profile_analyzer):
         """Test that reasoning is generated correctly."""
         profile = UserProfile(
-            user_id=str(uuid.uuid4()),
+            user_id=_UID,
             software_experience="advanced",
             hardware_experience="intermediate",
             programming_languages=["Python", "JavaScript"],
@@ -205,36 +237,38 @@ class TestContentAdapter:
         """Test beginner prompt emphasizes simple language."""
         prompt = ContentAdapter.ADAPTATION_PROMPTS[ExperienceLevel.BEGINNER]
 
-        assert "simple" in prompt.lower() or "clear" in prompt.lower()
+        assert "simple" in _LC[ExperienceLevel.BEGINNER] or "clear" in _LC[ExperienceLevel.BEGINNER]
         assert "PRESERVE" in prompt  # Technical terms preserved
 
     def test_advanced_prompt_mentions_technical_depth(self):
         """Test advanced prompt emphasizes technical depth."""
         prompt = ContentAdapter.ADAPTATION_PROMPTS[ExperienceLevel.ADVANCED]
 
-        assert "technical" in prompt.lower()
+        assert "technical" in _LC[ExperienceLevel.ADVANCED]
         assert "PRESERVE" in prompt  # Technical terms preserved
 
-    @pytest.mark.asyncio
     async def test_adapt_content_calls_openai(self):
         """Test that adapt_content calls OpenAI API."""
-        with patch('app.services.personalization_service.AsyncOpenAI') as mock_openai:
-            mock_client = MagicMock()
-            mock_response = MagicMock()
-            mock_response.choices = [MagicMock(message=MagicMock(content="Adapted content"))]
-            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-            mock_openai.return_value = mock_client
-
-            adapter = ContentAdapter(api_key="test-key")
-            adapter._client = mock_client
-
-            result = await adapter.adapt_content(
-                "Original content about robotics",
-                ExperienceLevel.BEGINNER,
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="Adapted content"))]
             )
 
-            assert result == "Adapted content"
-            mock_client.chat.completions.create.assert_called_once()
+        adapter = ContentAdapter(api_key="test-key")
+        adapter._client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+
+        result = await adapter.adapt_content(
+            "Original content about robotics",
+            ExperienceLevel.BEGINNER,
+        )
+
+        assert result == "Adapted content"
+        assert len(calls) == 1
 
 
 class TestPersonalizationCache:
@@ -243,40 +277,22 @@ class TestPersonalizationCache:
     Requirements: 7.4
     """
 
-    @pytest.mark.asyncio
-    async def test_get_cached_content_returns_none_when_no_pool(self):
-        """Test cache returns None when database pool is not available."""
-        with patch('app.services.personalization_service.get_postgres_db') as mock_db:
-            mock_db.return_value.pool = None
-
-            cache = PersonalizationCache()
-            result = await cache.get_cached_content("user-id", "chapter-id")
-
-            assert result is None
+    @pytest.mark.parametrize(
+        "method,args,expected",
+        [
+            ("get_cached_content", ("user-id", "chapter-id"), None),
+            ("store_cached_content", ("user-id", "chapter-id", "content", "beginner"), False),
+            ("invalidate_user_cache", ("user-id",), 0),
+        ],
+    )
+    async def test_returns_default_when_no_pool(self, no_pool_db, method, args, expected):
+        """Test cache operations return a default when database pool is not available."""
+        no_pool_db("app.services.personalization_service")
 
-    @pytest.mark.asyncio
-    async def test_store_cached_content_returns_false_when_no_pool(self):
-        """Test cache storage returns False when database pool is not available."""
-        with patch('app.services.personalization_service.get_postgres_db') as mock_db:
-            mock_db.return_value.pool = None
+        result = await getattr(PersonalizationCache(), method)(*args)
 
-            cache = PersonalizationCache()
-            result = await cache.store_cached_content(
-                "user-id", "chapter-id", "content", "beginner"
-            )
-
-            assert result is False
-
-    @pytest.mark.asyncio
-    async def test_invalidate_user_cache_returns_zero_when_no_pool(self):
-        """Test cache invalidation returns 0 when database pool is not available."""
-        with patch('app.services.personalization_service.get_postgres_db') as mock_db:
-            mock_db.return_value.pool = None
-
-            cache = PersonalizationCache()
-            result = await cache.invalidate_user_cache("user-id")
-
-            assert result == 0
+        assert result == expected
+        assert type(result) is type(expected)
 
 
 class TestPersonalizationService:
@@ -287,19 +303,18 @@ class TestPersonalizationService:
 
     def test_service_initialization_with_mocked_adapter(self):
         """Test service initializes with mocked content adapter."""
-        with patch('app.services.personalization_service.AsyncOpenAI'):
-            mock_adapter = MagicMock(spec=ContentAdapter)
-            service = PersonalizationService(content_adapter=mock_adapter)
+        mock_adapter = _stub_adapter()
+        service = PersonalizationService(content_adapter=mock_adapter)
 
-            assert service.profile_analyzer is not None
-            assert service.content_adapter is mock_adapter
-            assert service.cache is not None
+        assert service.profile_analyzer is not None
+        assert service.content_adapter is mock_adapter
+        assert service.cache is not None
 
     def test_service_with_custom_components(self):
         """Test service accepts custom components."""
         custom_analyzer = ProfileAnalyzer()
         custom_cache = PersonalizationCache()
-        mock_adapter = MagicMock(spec=ContentAdapter)
+        mock_adapter = _stub_adapter()
 
         service = PersonalizationService(
             profile_analyzer=custom_analyzer,
@@ -315,9 +330,9 @@ class TestPersonalizationService:
 class TestPersonalizationEndpoints:
     """Test personalization API endpoints."""
 
-    def test_personalize_endpoint_requires_auth(self, client):
+    async def test_personalize_endpoint_requires_auth(self, aclient):
         """Test personalization endpoint requires authentication."""
-        response = client.post(
+        response = await aclient.post(
             "/api/personalize",
             json={
                 "chapter_id": "intro",
@@ -327,9 +342,9 @@ class TestPersonalizationEndpoints:
 
         assert response.status_code == 401
 
-    def test_personalize_endpoint_invalid_token(self, client):
+    async def test_personalize_endpoint_invalid_token(self, aclient):
         """Test personalization endpoint with invalid token returns 401."""
-        response = client.post(
+        response = await aclient.post(
             "/api/personalize",
             json={
                 "chapter_id": "intro",
@@ -340,9 +355,9 @@ class TestPersonalizationEndpoints:
 
         assert response.status_code == 401
 
-    def test_personalize_endpoint_missing_fields(self, client):
+    async def test_personalize_endpoint_missing_fields(self, aclient):
         """Test personalization endpoint with missing fields returns 422."""
-        response = client.post(
+        response = await aclient.post(
             "/api/personalize",
             json={},
             headers={"Authorization": "Bearer some_token"},
@@ -351,9 +366,9 @@ class TestPersonalizationEndpoints:
         # Will be 401 first due to invalid token, but if auth passed, would be 422
         assert response.status_code in [401, 422]
 
-    def test_cache_invalidation_requires_auth(self, client):
+    async def test_cache_invalidation_requires_auth(self, aclient):
         """Test cache invalidation endpoint requires authentication."""
-        response = client.delete("/api/personalize/cache")
+        response = await aclient.delete("/api/personalize/cache")
 
         assert response.status_code == 401
 
@@ -363,9 +378,8 @@ class TestUserProfile:
 
     def test_user_profile_creation(self):
         """Test UserProfile can be created with all fields."""
-        user_id = str(uuid.uuid4())
         profile = UserProfile(
-            user_id=user_id,
+            user_id=_UID,
             software_experience="intermediate",
             hardware_experience="beginner",
             programming_languages=["Python", "JavaScript"],
@@ -373,7 +387,7 @@ class TestUserProfile:
             ai_experience=False,
         )
 
-        assert profile.user_id == user_id
+        assert profile.user_id == _UID
         assert profile.software_experience == "intermediate"
         assert profile.hardware_experience == "beginner"
         assert profile.programming_languages == ["Python", "JavaScript"]
@@ -382,7 +396,7 @@ class TestUserProfile:
 
     def test_user_profile_defaults(self):
         """Test UserProfile has correct defaults."""
-        profile = UserProfile(user_id=str(uuid.uuid4()))
+        profile = UserProfile(user_id=_UID)
 
         assert profile.software_experience is None
         assert profile.hardware_experience is None
@@ -398,7 +412,7 @@ class TestPersonalizedContentModels:
         """Test PersonalizedContentRequest model."""
         request = PersonalizedContentRequest(
             chapter_id="intro",
-            user_id=str(uuid.uuid4()),
+            user_id=_UID,
             original_content="Some content about robotics",
         )
 
@@ -409,7 +423,7 @@ class TestPersonalizedContentModels:
         """Test PersonalizedContentResponse model."""
         response = PersonalizedContentResponse(
             chapter_id="intro",
-            user_id=str(uuid.uuid4()),
+            user_id=_UID,
             personalized_content="Adapted content",
             experience_level="beginner",
             from_cache=False,
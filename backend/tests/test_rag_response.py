@@ -4,12 +4,17 @@ Requirements: 3.1, 3.2, 3.3, 3.5
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import replace
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
+import app.services.rag_service as rag_service_module
 from app.services.context_builder import ContextBuilder, BuiltContext
 from app.services.response_generator import (
     ResponseGenerator,
     GeneratedResponse,
+    StreamedResponse,
     Source,
     MIN_RELEVANCE_THRESHOLD,
 )
@@ -17,33 +22,123 @@ from app.services.rag_service import RAGService, RAGRequest, RAGResponse
 from app.services.retriever_service import RetrievedChunk, RetrievalResult
 
 
-def create_mock_chunk(
-    id: str = "chunk-1",
-    content: str = "Test content about robotics",
-    chapter_id: str = "motion-planning",
-    title: str = "Motion Planning",
-    section_title: str = "Introduction",
-    page_url: str = "/core/motion-planning",
-    position: int = 0,
-    score: float = 0.9,
-) -> RetrievedChunk:
-    """Create a mock RetrievedChunk for testing."""
-    return RetrievedChunk(
-        id=id,
-        content=content,
-        chapter_id=chapter_id,
-        title=title,
-        section_title=section_title,
-        page_url=page_url,
-        position=position,
-        score=score,
-    )
+# Template chunk that create_mock_chunk overrides field by field
+_DEFAULT_CHUNK = RetrievedChunk(
+    id="chunk-1",
+    content="Test content about robotics",
+    chapter_id="motion-planning",
+    title="Motion Planning",
+    section_title="Introduction",
+    page_url="/core/motion-planning",
+    position=0,
+    score=0.9,
+)
+
+
+@lru_cache(maxsize=128)
+def create_mock_chunk(**overrides) -> RetrievedChunk:
+    """Create a mock RetrievedChunk for testing.
+
+    Any RetrievedChunk field can be overridden by keyword. RetrievedChunk is
+    frozen, so calls with the same overrides share one cached instance.
+    """
+    return replace(_DEFAULT_CHUNK, **overrides)
+
+
+# Expected to_dict() output for the serialization tests
+_EXPECTED_SOURCE_DICT = {
+    "chapter_id": "motion-planning",
+    "title": "Motion Planning",
+    "section_title": "Introduction",
+    "page_url": "/core/motion-planning",
+    "relevance_score": 0.95,
+}
+
+_EXPECTED_GENERATED_DICT = {
+    "response": "Test response",
+    "sources": [
+        {
+            "chapter_id": "ch1",
+            "title": "Title",
+            "section_title": "Section",
+            "page_url": "/url",
+            "relevance_score": 0.9,
+        }
+    ],
+    "is_fallback": False,
+    "query": "Test query",
+    "selected_text": "Selected",
+}
+
+_EXPECTED_RAG_DICT = {
+    "response": "Test response",
+    "sources": [{"chapter_id": "ch1", "title": "Title"}],
+    "is_fallback": False,
+    "query": "Test query",
+    "selected_text": "Selected",
+}
+
+
+class _StubCompletions:
+    """Records chat.completions.create calls and returns a canned response."""
+
+    def __init__(self, content: str):
+        self.calls: list[dict] = []
+        self._content = content
+        self._response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            return self._stream()
+        return self._response
+
+    async def _stream(self):
+        """Yield the canned response word by word, ending with an empty delta."""
+        for piece in [*(word + " " for word in self._content.split(" ")), None]:
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class _StubOpenAI:
+    """Minimal AsyncOpenAI stand-in exposing chat.completions.create."""
+
+    def __init__(self, content: str):
+        self.chat = SimpleNamespace(completions=_StubCompletions(content))
+
+
+class _StubResponseGenerator:
+    """Records generate_response calls and returns a canned response."""
+
+    def __init__(self, result: GeneratedResponse):
+        self.calls: list[dict] = []
+        self._result = result
+
+    async def generate_response(self, **kwargs) -> GeneratedResponse:
+        self.calls.append(kwargs)
+        return self._result
+
+    async def generate_response_stream(self, **kwargs) -> StreamedResponse:
+        self.calls.append(kwargs)
+
+        async def text_stream():
+            yield self._result.response
+
+        return StreamedResponse(
+            text_stream=text_stream(),
+            sources=self._result.sources,
+            is_fallback=self._result.is_fallback,
+            query=self._result.query,
+            selected_text=self._result.selected_text,
+        )
 
 
 class TestContextBuilder:
     """Tests for ContextBuilder class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def builder(self):
         """Create context builder instance."""
         return ContextBuilder(max_tokens=1000, max_chunks=5)
@@ -152,17 +247,12 @@ class TestContextBuilder:
 class TestResponseGenerator:
     """Tests for ResponseGenerator class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_openai_client(self):
-        """Create mock OpenAI client."""
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "This is a test response about robotics."
-        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-        return mock_client
-
-    @pytest.fixture
+        """Create stub OpenAI client."""
+        return _StubOpenAI("This is a test response about robotics.")
+
+    @pytest.fixture(scope="module")
     def generator(self, mock_openai_client):
         """Create response generator with mocked client."""
         gen = ResponseGenerator(api_key="test-api-key")
@@ -182,29 +272,20 @@ class TestResponseGenerator:
         # Should have 2 unique sources (ch1:sec1 and ch1:sec2)
         assert len(sources) == 2
 
-    def test_has_relevant_results_true(self, generator):
-        """Test relevance check with relevant chunks."""
-        chunks = [
-            create_mock_chunk(score=0.8),
-            create_mock_chunk(score=0.6),
-        ]
-
-        assert generator._has_relevant_results(chunks) is True
-
-    def test_has_relevant_results_false(self, generator):
-        """Test relevance check with no relevant chunks."""
-        chunks = [
-            create_mock_chunk(score=0.4),  # Below 0.5 threshold
-            create_mock_chunk(score=0.3),
-        ]
-
-        assert generator._has_relevant_results(chunks) is False
+    @pytest.mark.parametrize(
+        "scores,expected",
+        [
+            ((0.8, 0.6), True),
+            ((0.4, 0.3), False),  # Below 0.5 threshold
+            ((), False),
+        ],
+    )
+    def test_has_relevant_results(self, generator, scores, expected):
+        """Test relevance check with relevant, irrelevant and no chunks."""
+        chunks = [create_mock_chunk(score=score) for score in scores]
 
-    def test_has_relevant_results_empty(self, generator):
-        """Test relevance check with empty chunks."""
-        assert generator._has_relevant_results([]) is False
+        assert generator._has_relevant_results(chunks) is expected
 
-    @pytest.mark.asyncio
     async def test_generate_response_with_relevant_chunks(self, generator):
         """Test response generation with relevant chunks."""
         chunks = [create_mock_chunk(score=0.9)]
@@ -225,7 +306,6 @@ class TestResponseGenerator:
         assert len(result.sources) > 0
         assert result.response != ""
 
-    @pytest.mark.asyncio
     async def test_generate_response_fallback(self, generator):
         """Test fallback response when no relevant chunks."""
         chunks = [create_mock_chunk(score=0.4)]  # Below 0.5 threshold
@@ -244,7 +324,6 @@ class TestResponseGenerator:
         assert result.is_fallback is True
         assert result.sources == []
 
-    @pytest.mark.asyncio
     async def test_generate_response_with_selected_text(self, generator):
         """Test response generation with selected text."""
         chunks = [create_mock_chunk(score=0.9)]
@@ -264,9 +343,10 @@ class TestResponseGenerator:
 
         assert result.selected_text == selected_text
 
-    @pytest.mark.asyncio
     async def test_call_openai_normal(self, generator, mock_openai_client):
         """Test OpenAI API call for normal response."""
+        mock_openai_client.chat.completions.calls.clear()
+
         result = await generator._call_openai(
             query="What is robotics?",
             context="Robotics is the study of robots.",
@@ -274,11 +354,12 @@ class TestResponseGenerator:
         )
 
         assert result == "This is a test response about robotics."
-        mock_openai_client.chat.completions.create.assert_called_once()
+        assert len(mock_openai_client.chat.completions.calls) == 1
 
-    @pytest.mark.asyncio
     async def test_call_openai_fallback(self, generator, mock_openai_client):
         """Test OpenAI API call for fallback response."""
+        mock_openai_client.chat.completions.calls.clear()
+
         result = await generator._call_openai(
             query="What is quantum computing?",
             context="",
@@ -286,7 +367,61 @@ class TestResponseGenerator:
         )
 
         assert result == "This is a test response about robotics."
-        mock_openai_client.chat.completions.create.assert_called_once()
+        assert len(mock_openai_client.chat.completions.calls) == 1
+
+    async def test_call_openai_stream(self, generator, mock_openai_client):
+        """Test that streamed OpenAI output is yielded incrementally."""
+        mock_openai_client.chat.completions.calls.clear()
+
+        pieces = [
+            piece
+            async for piece in generator._call_openai_stream(
+                query="What is robotics?",
+                context="Robotics is the study of robots.",
+                is_fallback=False,
+            )
+        ]
+
+        assert len(pieces) > 1
+        assert "".join(pieces).strip() == "This is a test response about robotics."
+        assert mock_openai_client.chat.completions.calls[0]["stream"] is True
+
+    async def test_generate_response_stream(self, generator):
+        """Test that a streamed response carries sources before any text."""
+        retrieval_result = RetrievalResult(
+            query="What is motion planning?",
+            processed_query="what is motion planning?",
+            chunks=[create_mock_chunk(score=0.9)],
+            total_found=1,
+        )
+
+        result = await generator.generate_response_stream(
+            query="What is motion planning?",
+            retrieval_result=retrieval_result,
+        )
+
+        assert result.is_fallback is False
+        assert [s.chapter_id for s in result.sources] == ["motion-planning"]
+        text = "".join([piece async for piece in result.text_stream])
+        assert text.strip() == "This is a test response about robotics."
+
+    async def test_generate_response_stream_fallback(self, generator):
+        """Test that streaming falls back when nothing relevant is found."""
+        retrieval_result = RetrievalResult(
+            query="What is quantum computing?",
+            processed_query="what is quantum computing?",
+            chunks=[],
+            total_found=0,
+        )
+
+        result = await generator.generate_response_stream(
+            query="What is quantum computing?",
+            retrieval_result=retrieval_result,
+        )
+
+        assert result.is_fallback is True
+        assert result.sources == []
+        assert "".join([piece async for piece in result.text_stream])
 
 
 class TestSource:
@@ -302,13 +437,7 @@ class TestSource:
             relevance_score=0.95,
         )
 
-        result = source.to_dict()
-
-        assert result["chapter_id"] == "motion-planning"
-        assert result["title"] == "Motion Planning"
-        assert result["section_title"] == "Introduction"
-        assert result["page_url"] == "/core/motion-planning"
-        assert result["relevance_score"] == 0.95
+        assert source.to_dict() == _EXPECTED_SOURCE_DICT
 
 
 class TestGeneratedResponse:
@@ -331,19 +460,13 @@ class TestGeneratedResponse:
             selected_text="Selected",
         )
 
-        result = response.to_dict()
-
-        assert result["response"] == "Test response"
-        assert len(result["sources"]) == 1
-        assert result["is_fallback"] is False
-        assert result["query"] == "Test query"
-        assert result["selected_text"] == "Selected"
+        assert response.to_dict() == _EXPECTED_GENERATED_DICT
 
 
 class TestRAGService:
     """Tests for RAGService class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_retriever(self):
         """Create mock retriever."""
         mock = MagicMock()
@@ -357,12 +480,11 @@ class TestRAGService:
         )
         return mock
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_response_generator(self):
-        """Create mock response generator."""
-        mock = MagicMock()
-        mock.generate_response = AsyncMock(
-            return_value=GeneratedResponse(
+        """Create stub response generator."""
+        return _StubResponseGenerator(
+            GeneratedResponse(
                 response="Test response",
                 sources=[
                     Source(
@@ -378,19 +500,24 @@ class TestRAGService:
                 selected_text=None,
             )
         )
-        return mock
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def rag_service(self, mock_retriever, mock_response_generator):
-        """Create RAG service with mocks."""
+        """Create RAG service with mocks and no answer cache.
+
+        The service is shared across tests, so caching answers would make
+        retriever call assertions depend on test order.
+        """
         return RAGService(
             retriever=mock_retriever,
             response_generator=mock_response_generator,
+            answer_cache_size=0,
         )
 
-    @pytest.mark.asyncio
     async def test_process_query(self, rag_service, mock_retriever, mock_response_generator):
         """Test RAG query processing."""
+        mock_retriever.retrieve.reset_mock()
+
         request = RAGRequest(
             query="What is motion planning?",
             top_k=5,
@@ -410,7 +537,6 @@ class TestRAGService:
             score_threshold=0.7,
         )
 
-    @pytest.mark.asyncio
     async def test_process_query_with_selected_text(
         self, rag_service, mock_retriever, mock_response_generator
     ):
@@ -423,8 +549,78 @@ class TestRAGService:
         await rag_service.process_query(request)
 
         # Verify selected text was passed to response generator
-        call_args = mock_response_generator.generate_response.call_args
-        assert call_args.kwargs["selected_text"] == "Motion planning involves..."
+        assert mock_response_generator.calls[-1]["selected_text"] == "Motion planning involves..."
+
+    async def test_process_query_stream(self, rag_service, mock_response_generator):
+        """Test streamed RAG query yields the generated answer."""
+        request = RAGRequest(query="What is ROS 2?", selected_text="Nodes")
+
+        streamed = await rag_service.process_query_stream(request)
+        text = "".join([piece async for piece in streamed.text_stream])
+
+        assert text == "Test response"
+        assert streamed.sources[0].chapter_id == "ch1"
+        assert mock_response_generator.calls[-1]["selected_text"] == "Nodes"
+
+    async def test_process_query_caches_answers(self, mock_retriever, mock_response_generator):
+        """Test that a repeated query is answered from the cache."""
+        mock_retriever.retrieve.reset_mock()
+        service = RAGService(
+            retriever=mock_retriever,
+            response_generator=mock_response_generator,
+        )
+        request = RAGRequest(query="What is a humanoid robot?")
+
+        first = await service.process_query(request)
+        second = await service.process_query(request)
+
+        assert second == first
+        assert mock_retriever.retrieve.call_count == 1
+
+    async def test_cached_answer_is_isolated_from_callers(
+        self, mock_retriever, mock_response_generator
+    ):
+        """Test that mutating a returned response does not change later hits."""
+        service = RAGService(
+            retriever=mock_retriever,
+            response_generator=mock_response_generator,
+        )
+        request = RAGRequest(query="What is a humanoid robot?")
+
+        first = await service.process_query(request)
+        expected_sources = [dict(s) for s in first.sources]
+        first.sources.append({"title": "injected"})
+        second = await service.process_query(request)
+        second.sources[0]["title"] = "changed"
+        third = await service.process_query(request)
+
+        assert third.sources == expected_sources
+
+    async def test_process_query_cache_expires(
+        self, mock_retriever, mock_response_generator, monkeypatch
+    ):
+        """Test that expired answers are regenerated."""
+        now = [0.0]
+        monkeypatch.setattr(
+            rag_service_module, "time", SimpleNamespace(monotonic=lambda: now[0])
+        )
+        mock_retriever.retrieve.reset_mock()
+        service = RAGService(
+            retriever=mock_retriever,
+            response_generator=mock_response_generator,
+            answer_cache_ttl=60,
+        )
+        request = RAGRequest(query="What is a humanoid robot?")
+
+        await service.process_query(request)
+        now[0] = 30.0
+        await service.process_query(request)
+        assert mock_retriever.retrieve.call_count == 1
+
+        now[0] = 91.0
+        await service.process_query(request)
+
+        assert mock_retriever.retrieve.call_count == 2
 
 
 class TestRAGResponse:
@@ -440,10 +636,4 @@ class TestRAGResponse:
             selected_text="Selected",
         )
 
-        result = response.to_dict()
-
-        assert result["response"] == "Test response"
-        assert len(result["sources"]) == 1
-        assert result["is_fallback"] is False
-        assert result["query"] == "Test query"
-        assert result["selected_text"] == "Selected"
+        assert response.to_dict() == _EXPECTED_RAG_DICT
@@ -4,11 +4,14 @@ Requirements: 4.2
 """
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from dataclasses import dataclass, field
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 from app.services.query_processor import (
     QueryProcessor,
     ProcessedQuery,
+    QueryEmbeddingCache,
 )
 from app.services.retriever_service import (
     VectorRetriever,
@@ -18,33 +21,119 @@ from app.services.retriever_service import (
 from app.services.embedding_service import EmbeddingResult
 
 
+# Query embedding shared by tests; nothing under test mutates it
+_FAKE_EMBEDDING: tuple[float, ...] = (0.1,) * 1536
+
+
+# Qdrant search results returned by the stub database
+_QDRANT_RESULTS: list[dict[str, Any]] = [
+    {
+        "id": "chunk-1",
+        "score": 0.95,
+        "payload": {
+            "content": "Robot motion planning involves...",
+            "chapter_id": "motion-planning",
+            "title": "Motion Planning",
+            "section_title": "Introduction",
+            "page_url": "/core/motion-planning",
+            "position": 0,
+        },
+    },
+    {
+        "id": "chunk-2",
+        "score": 0.85,
+        "payload": {
+            "content": "Path planning algorithms...",
+            "chapter_id": "motion-planning",
+            "title": "Motion Planning",
+            "section_title": "Algorithms",
+            "page_url": "/core/motion-planning",
+            "position": 1,
+        },
+    },
+]
+
+# Search results spanning two chapters, for chapter filtering tests
+_QDRANT_MIXED_RESULTS: list[dict[str, Any]] = [
+    {
+        "id": "chunk-1",
+        "score": 0.95,
+        "payload": {
+            "content": "Content 1",
+            "chapter_id": "motion-planning",
+            "title": "Motion Planning",
+            "section_title": "Intro",
+            "page_url": "/motion-planning",
+            "position": 0,
+        },
+    },
+    {
+        "id": "chunk-2",
+        "score": 0.90,
+        "payload": {
+            "content": "Content 2",
+            "chapter_id": "computer-vision",
+            "title": "Computer Vision",
+            "section_title": "Intro",
+            "page_url": "/computer-vision",
+            "position": 0,
+        },
+    },
+]
+
+
+# Expected to_dict() output for the serialization tests
+_EXPECTED_CHUNK_DICT = {
+    "id": "test-id",
+    "content": "Test content",
+    "chapter_id": "test-chapter",
+    "title": "Test Title",
+    "section_title": "Test Section",
+    "page_url": "/test",
+    "position": 0,
+    "score": 0.95,
+}
+
+
+@dataclass
+class _StubQdrant:
+    """Qdrant stand-in whose search records its arguments and returns results."""
+
+    results: list[dict[str, Any]]
+    calls: list[dict[str, Any]] = field(default_factory=list)
+
+    async def search(self, **kwargs) -> list[dict[str, Any]]:
+        self.calls.append(kwargs)
+        return self.results
+
+
 class TestQueryProcessor:
     """Tests for QueryProcessor class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def processor(self):
         """Create processor instance without embedding service."""
         return QueryProcessor(enable_expansion=True)
 
-    def test_preprocess_query_normalizes_whitespace(self, processor):
-        """Test that preprocessing normalizes whitespace."""
-        query = "  What   is   robot   motion  planning?  "
-        result = processor.preprocess_query(query)
-        assert result == "what is robot motion planning?"
-
-    def test_preprocess_query_lowercases(self, processor):
-        """Test that preprocessing converts to lowercase."""
-        query = "What Is ROBOT Motion Planning?"
+    @pytest.mark.parametrize(
+        "query,expected,expected_not_contains",
+        [
+            # Normalizes whitespace
+            ("  What   is   robot   motion  planning?  ", "what is robot motion planning?", []),
+            # Lowercases
+            ("What Is ROBOT Motion Planning?", "what is robot motion planning?", []),
+            # Removes excessive punctuation
+            ("What is robot!!! motion... planning???", None, ["!!!", "..."]),
+        ],
+    )
+    def test_preprocess_query(self, processor, query, expected, expected_not_contains):
+        """Test that preprocessing normalizes whitespace, case and punctuation."""
         result = processor.preprocess_query(query)
-        assert result == "what is robot motion planning?"
 
-    def test_preprocess_query_removes_punctuation(self, processor):
-        """Test that preprocessing removes excessive punctuation."""
-        query = "What is robot!!! motion... planning???"
-        result = processor.preprocess_query(query)
-        # Should keep question marks but remove others
-        assert "!!!" not in result
-        assert "..." not in result
+        if expected is not None:
+            assert result == expected
+        for text in expected_not_contains:
+            assert text not in result
 
     def test_expand_query_finds_synonyms(self, processor):
         """Test that query expansion finds domain synonyms."""
@@ -66,6 +155,15 @@ class TestQueryProcessor:
         for term in expanded:
             assert term.lower() not in query.lower()
 
+    def test_expand_query_is_ordered_and_unique(self, processor):
+        """Test that expansions follow query word order without repeats."""
+        expanded = processor.expand_query("sensor navigation")
+
+        assert expanded == [
+            "sensors", "perception", "sensing", "lidar", "camera", "imu",
+            "localization", "mapping", "slam",
+        ]
+
     def test_expand_query_disabled(self):
         """Test that expansion can be disabled."""
         processor = QueryProcessor(enable_expansion=False)
@@ -98,7 +196,6 @@ class TestQueryProcessor:
         # Should limit expansions
         assert result.count(" ") < 10  # Not too many terms
 
-    @pytest.mark.asyncio
     async def test_process_query_returns_processed_query(self):
         """Test that process_query returns a ProcessedQuery object."""
         # Mock the embedding service
@@ -106,7 +203,7 @@ class TestQueryProcessor:
         mock_embedding_service.generate_embedding = AsyncMock(
             return_value=EmbeddingResult(
                 text="test query",
-                embedding=[0.1] * 1536,
+                embedding=_FAKE_EMBEDDING,
                 token_count=2,
             )
         )
@@ -124,43 +221,59 @@ class TestQueryProcessor:
         assert len(result.embedding) == 1536
         assert isinstance(result.expanded_terms, list)
 
+    @pytest.mark.parametrize(
+        "second_query",
+        [
+            "What is robot motion planning?",
+            "  what IS   robot motion planning?  ",
+        ],
+    )
+    async def test_process_query_reuses_cached_embedding(self, second_query):
+        """Test that repeated or near-duplicate queries are embedded once."""
+        mock_embedding_service = MagicMock()
+        mock_embedding_service.generate_embedding = AsyncMock(
+            return_value=EmbeddingResult(
+                text="test query",
+                embedding=_FAKE_EMBEDDING,
+                token_count=2,
+            )
+        )
+        processor = QueryProcessor(embedding_service=mock_embedding_service)
+
+        first = await processor.process_query("What is robot motion planning?")
+        second = await processor.process_query(second_query)
+
+        mock_embedding_service.generate_embedding.assert_called_once()
+        assert second.embedding == first.embedding
+        assert second.original_query == second_query
+
+
+class TestQueryEmbeddingCache:
+    """Tests for QueryEmbeddingCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = QueryEmbeddingCache(max_size=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+
+        cache.put("c", [3.0])
+
+        assert len(cache) == 2
+        assert cache.get("a") == [1.0]
+        assert cache.get("b") is None
+
 
 class TestVectorRetriever:
     """Tests for VectorRetriever class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_qdrant_db(self):
-        """Create mock Qdrant database."""
-        mock_db = MagicMock()
-        mock_db.search = AsyncMock(return_value=[
-            {
-                "id": "chunk-1",
-                "score": 0.95,
-                "payload": {
-                    "content": "Robot motion planning involves...",
-                    "chapter_id": "motion-planning",
-                    "title": "Motion Planning",
-                    "section_title": "Introduction",
-                    "page_url": "/core/motion-planning",
-                    "position": 0,
-                },
-            },
-            {
-                "id": "chunk-2",
-                "score": 0.85,
-                "payload": {
-                    "content": "Path planning algorithms...",
-                    "chapter_id": "motion-planning",
-                    "title": "Motion Planning",
-                    "section_title": "Algorithms",
-                    "page_url": "/core/motion-planning",
-                    "position": 1,
-                },
-            },
-        ])
-        return mock_db
-
-    @pytest.fixture
+        """Create stub Qdrant database."""
+        return _StubQdrant(_QDRANT_RESULTS)
+
+    @pytest.fixture(scope="module")
     def mock_query_processor(self):
         """Create mock query processor."""
         mock_processor = MagicMock()
@@ -169,12 +282,11 @@ class TestVectorRetriever:
                 original_query="What is motion planning?",
                 processed_query="what is motion planning?",
                 expanded_terms=["path planning", "trajectory"],
-                embedding=[0.1] * 1536,
+                embedding=_FAKE_EMBEDDING,
             )
         )
         return mock_processor
 
-    @pytest.mark.asyncio
     async def test_retrieve_returns_retrieval_result(
         self, mock_qdrant_db, mock_query_processor
     ):
@@ -192,7 +304,6 @@ class TestVectorRetriever:
         assert len(result.chunks) == 2
         assert result.total_found == 2
 
-    @pytest.mark.asyncio
     async def test_retrieve_chunks_have_correct_structure(
         self, mock_qdrant_db, mock_query_processor
     ):
@@ -211,59 +322,37 @@ class TestVectorRetriever:
             assert chunk.chapter_id is not None
             assert chunk.score > 0
 
-    @pytest.mark.asyncio
-    async def test_retrieve_respects_top_k(
-        self, mock_qdrant_db, mock_query_processor
-    ):
-        """Test that retrieve respects top_k parameter."""
-        retriever = VectorRetriever(
-            qdrant_db=mock_qdrant_db,
-            query_processor=mock_query_processor,
-        )
-
-        await retriever.retrieve("test query", top_k=3)
-
-        # Verify search was called with correct limit
-        mock_qdrant_db.search.assert_called_once()
-        call_kwargs = mock_qdrant_db.search.call_args.kwargs
-        assert call_kwargs["limit"] == 3
-
-    @pytest.mark.asyncio
-    async def test_retrieve_respects_score_threshold(
-        self, mock_qdrant_db, mock_query_processor
+    @pytest.mark.parametrize(
+        "retriever_kwargs,retrieve_kwargs,expected",
+        [
+            ({}, {"top_k": 3}, {"limit": 3}),
+            ({}, {"score_threshold": 0.8}, {"score_threshold": 0.8}),
+            (
+                {"default_top_k": 10, "default_score_threshold": 0.75},
+                {},
+                {"limit": 10, "score_threshold": 0.75},
+            ),
+        ],
+    )
+    async def test_retrieve_respects_search_parameters(
+        self, mock_qdrant_db, mock_query_processor, retriever_kwargs, retrieve_kwargs, expected
     ):
-        """Test that retrieve respects score_threshold parameter."""
-        retriever = VectorRetriever(
-            qdrant_db=mock_qdrant_db,
-            query_processor=mock_query_processor,
-        )
-
-        await retriever.retrieve("test query", score_threshold=0.8)
-
-        # Verify search was called with correct threshold
-        mock_qdrant_db.search.assert_called_once()
-        call_kwargs = mock_qdrant_db.search.call_args.kwargs
-        assert call_kwargs["score_threshold"] == 0.8
+        """Test that retrieve passes explicit or default parameters to search."""
+        mock_qdrant_db.calls.clear()
 
-    @pytest.mark.asyncio
-    async def test_retrieve_uses_default_parameters(
-        self, mock_qdrant_db, mock_query_processor
-    ):
-        """Test that retrieve uses default parameters when not specified."""
         retriever = VectorRetriever(
             qdrant_db=mock_qdrant_db,
             query_processor=mock_query_processor,
-            default_top_k=10,
-            default_score_threshold=0.75,
+            **retriever_kwargs,
         )
 
-        await retriever.retrieve("test query")
+        await retriever.retrieve("test query", **retrieve_kwargs)
 
-        call_kwargs = mock_qdrant_db.search.call_args.kwargs
-        assert call_kwargs["limit"] == 10
-        assert call_kwargs["score_threshold"] == 0.75
+        assert len(mock_qdrant_db.calls) == 1
+        call_kwargs = mock_qdrant_db.calls[-1]
+        for key, value in expected.items():
+            assert call_kwargs[key] == value
 
-    @pytest.mark.asyncio
     async def test_retrieve_limits_max_top_k(
         self, mock_qdrant_db, mock_query_processor
     ):
@@ -275,22 +364,21 @@ class TestVectorRetriever:
 
         await retriever.retrieve("test query", top_k=100)
 
-        call_kwargs = mock_qdrant_db.search.call_args.kwargs
+        call_kwargs = mock_qdrant_db.calls[-1]
         assert call_kwargs["limit"] <= VectorRetriever.MAX_TOP_K
 
-    @pytest.mark.asyncio
     async def test_retrieve_with_embedding(self, mock_qdrant_db):
         """Test retrieve_with_embedding method."""
+        mock_qdrant_db.calls.clear()
+
         retriever = VectorRetriever(qdrant_db=mock_qdrant_db)
 
-        embedding = [0.1] * 1536
-        chunks = await retriever.retrieve_with_embedding(embedding, top_k=5)
+        chunks = await retriever.retrieve_with_embedding(_FAKE_EMBEDDING, top_k=5)
 
         assert len(chunks) == 2
         assert all(isinstance(c, RetrievedChunk) for c in chunks)
-        mock_qdrant_db.search.assert_called_once()
+        assert len(mock_qdrant_db.calls) == 1
 
-    @pytest.mark.asyncio
     async def test_retrieve_by_chapter_filters_results(
         self, mock_qdrant_db, mock_query_processor
     ):
@@ -309,39 +397,11 @@ class TestVectorRetriever:
         for chunk in result.chunks:
             assert chunk.chapter_id == "motion-planning"
 
-    @pytest.mark.asyncio
     async def test_retrieve_by_chapter_excludes_other_chapters(
         self, mock_query_processor
     ):
         """Test that retrieve_by_chapter excludes other chapters."""
-        # Mock with mixed chapter results
-        mock_db = MagicMock()
-        mock_db.search = AsyncMock(return_value=[
-            {
-                "id": "chunk-1",
-                "score": 0.95,
-                "payload": {
-                    "content": "Content 1",
-                    "chapter_id": "motion-planning",
-                    "title": "Motion Planning",
-                    "section_title": "Intro",
-                    "page_url": "/motion-planning",
-                    "position": 0,
-                },
-            },
-            {
-                "id": "chunk-2",
-                "score": 0.90,
-                "payload": {
-                    "content": "Content 2",
-                    "chapter_id": "computer-vision",
-                    "title": "Computer Vision",
-                    "section_title": "Intro",
-                    "page_url": "/computer-vision",
-                    "position": 0,
-                },
-            },
-        ])
+        mock_db = _StubQdrant(_QDRANT_MIXED_RESULTS)
 
         retriever = VectorRetriever(
             qdrant_db=mock_db,
@@ -373,16 +433,7 @@ class TestRetrievedChunk:
             score=0.95,
         )
 
-        result = chunk.to_dict()
-
-        assert result["id"] == "test-id"
-        assert result["content"] == "Test content"
-        assert result["chapter_id"] == "test-chapter"
-        assert result["title"] == "Test Title"
-        assert result["section_title"] == "Test Section"
-        assert result["page_url"] == "/test"
-        assert result["position"] == 0
-        assert result["score"] == 0.95
+        assert chunk.to_dict() == _EXPECTED_CHUNK_DICT
 
 
 class TestRetrievalResult:
@@ -408,9 +459,9 @@ class TestRetrievalResult:
             total_found=1,
         )
 
-        result_dict = result.to_dict()
-
-        assert result_dict["query"] == "test query"
-        assert result_dict["processed_query"] == "test query"
-        assert len(result_dict["chunks"]) == 1
-        assert result_dict["total_found"] == 1
+        assert result.to_dict() == {
+            "query": "test query",
+            "processed_query": "test query",
+            "chunks": [_EXPECTED_CHUNK_DICT],
+            "total_found": 1,
+        }
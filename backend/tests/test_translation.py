@@ -4,9 +4,12 @@ Tests the translation engine, RTL formatting, and caching functionality.
 Requirements: 8.1, 8.2, 8.3, 8.4
 """
 
+import json
 import pytest
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import app.services.translation_service as translation_service_module
 from app.services.translation_service import (
     TranslationService,
     TranslationEngine,
@@ -18,101 +21,152 @@ from app.services.translation_service import (
 )
 
 
+# Request body for the translate endpoint auth checks, serialized once
+_AUTH_BODY = json.dumps({"chapter_id": "chapter-1", "content": "Hello"}).encode()
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@pytest.fixture
+def mock_async_openai():
+    """Patch AsyncOpenAI so services never build a real OpenAI client."""
+    with patch("app.services.translation_service.AsyncOpenAI") as mock_openai:
+        yield mock_openai
+
+
+@pytest.fixture
+def fake_openai(mock_async_openai):
+    """Make the patched AsyncOpenAI return a client with a canned translation."""
+    client = MagicMock()
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="اردو ترجمہ"))]
+    )
+    client.chat.completions.create = AsyncMock(return_value=response)
+    mock_async_openai.return_value = client
+    return client
+
+
+@pytest.fixture
+def reset_translation_service(monkeypatch):
+    """Clear the global translation service; pytest restores it afterwards."""
+    monkeypatch.setattr(translation_service_module, "_translation_service", None)
+
+
+@pytest.fixture(scope="module")
+def term_handler():
+    """Create a technical term handler shared by the module's tests."""
+    return TechnicalTermHandler()
+
+
+@pytest.fixture(scope="module")
+def rtl_formatter():
+    """Create an RTL formatter shared by the module's tests."""
+    return RTLFormatter()
+
+
 class TestTechnicalTermHandler:
     """Tests for TechnicalTermHandler class."""
 
-    def test_get_transliteration_known_term(self):
-        """Test getting transliteration for a known technical term."""
-        handler = TechnicalTermHandler()
-        result = handler.get_transliteration("robot")
-        assert result == "روبوٹ"
-
-    def test_get_transliteration_case_insensitive(self):
-        """Test that transliteration lookup is case-insensitive."""
-        handler = TechnicalTermHandler()
-        assert handler.get_transliteration("ROBOT") == "روبوٹ"
-        assert handler.get_transliteration("Robot") == "روبوٹ"
-
-    def test_get_transliteration_unknown_term(self):
-        """Test getting transliteration for an unknown term returns None."""
-        handler = TechnicalTermHandler()
-        result = handler.get_transliteration("unknownterm123")
-        assert result is None
-
-    def test_extract_technical_terms(self):
+    @pytest.mark.parametrize(
+        "term,expected",
+        [
+            # Known technical term
+            ("robot", "روبوٹ"),
+            # Lookup is case-insensitive
+            ("ROBOT", "روبوٹ"),
+            ("Robot", "روبوٹ"),
+            # Unknown terms have no transliteration
+            ("unknownterm123", None),
+        ],
+    )
+    def test_get_transliteration(self, term_handler, term, expected):
+        """Test transliteration lookup for known, recased and unknown terms."""
+        assert term_handler.get_transliteration(term) == expected
+
+    def test_extract_technical_terms(self, term_handler):
         """Test extracting technical terms from content."""
-        handler = TechnicalTermHandler()
         content = "The robot uses AI and machine learning for navigation."
-        terms = handler.extract_technical_terms(content)
+        terms = term_handler.extract_technical_terms(content)
 
         # Should find robot, AI, and machine learning
-        term_originals = [t.original.lower() for t in terms]
-        assert "robot" in term_originals
-        assert "ai" in term_originals
-        assert "machine learning" in term_originals
-
-    def test_create_term_glossary(self):
+        term_originals = {t.original.lower() for t in terms}
+        assert {"robot", "ai", "machine learning"} <= term_originals
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            # Non-ASCII letters that match ASCII ones case-insensitively
+            ("Aİ model", [("Aİ", 0), ("model", 3)]),
+            ("İ ROBOTİCS ſensor", [("ROBOT", 2), ("ROBOTİCS", 2), ("ſensor", 11)]),
+            # Overlapping terms are each reported
+            ("Robotics training", [("Robot", 0), ("Robotics", 0), ("training", 9), ("ai", 11)]),
+        ],
+    )
+    def test_extract_technical_terms_matches(self, term_handler, content, expected):
+        """Test term extraction with non-ASCII casing and overlapping terms."""
+        terms = term_handler.extract_technical_terms(content)
+
+        assert [(t.original, t.position) for t in terms] == expected
+
+    def test_create_term_glossary(self, term_handler):
         """Test creating a glossary of technical terms."""
-        handler = TechnicalTermHandler()
         content = "The robot uses sensors for perception."
-        glossary = handler.create_term_glossary(content)
+        glossary = term_handler.create_term_glossary(content)
 
         assert "Technical Terms Glossary:" in glossary
-        assert "robot" in glossary.lower()
-        assert "sensor" in glossary.lower()
+        glossary_lower = glossary.lower()
+        assert "robot" in glossary_lower
+        assert "sensor" in glossary_lower
 
-    def test_create_term_glossary_empty_content(self):
+    def test_create_term_glossary_empty_content(self, term_handler):
         """Test glossary creation with no technical terms."""
-        handler = TechnicalTermHandler()
         content = "This is a simple sentence with no technical terms."
-        glossary = handler.create_term_glossary(content)
+        glossary = term_handler.create_term_glossary(content)
         assert glossary == ""
 
 
 class TestRTLFormatter:
     """Tests for RTLFormatter class."""
 
-    def test_apply_rtl_formatting(self):
+    def test_apply_rtl_formatting(self, rtl_formatter):
         """Test applying RTL formatting to content."""
-        formatter = RTLFormatter()
         content = "اردو متن"
-        result = formatter.apply_rtl_formatting(content)
+        result = rtl_formatter.apply_rtl_formatting(content)
 
         assert 'dir="rtl"' in result
         assert 'class="rtl-content"' in result
         assert content in result
 
-    def test_has_urdu_content_true(self):
-        """Test detecting Urdu content."""
-        formatter = RTLFormatter()
-        content = "This contains اردو text"
-        assert formatter.has_urdu_content(content) is True
-
-    def test_has_urdu_content_false(self):
-        """Test detecting non-Urdu content."""
-        formatter = RTLFormatter()
-        content = "This is English only"
-        assert formatter.has_urdu_content(content) is False
-
-    def test_get_rtl_css(self):
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            ("This contains اردو text", True),
+            ("Arabic Supplement \u0750 letter", True),
+            ("This is English only", False),
+        ],
+    )
+    def test_has_urdu_content(self, rtl_formatter, content, expected):
+        """Test detecting whether content contains Urdu."""
+        assert rtl_formatter.has_urdu_content(content) is expected
+
+    def test_get_rtl_css(self, rtl_formatter):
         """Test getting RTL CSS styles."""
-        formatter = RTLFormatter()
-        css = formatter.get_rtl_css()
+        css = rtl_formatter.get_rtl_css()
 
+        assert css is RTLFormatter.RTL_CSS
         assert ".rtl-content" in css
         assert "direction: rtl" in css
         assert "text-align: right" in css
 
-    def test_rtl_css_preserves_code_blocks(self):
+    def test_rtl_css_preserves_code_blocks(self, rtl_formatter):
         """Test that RTL CSS preserves LTR for code blocks."""
-        formatter = RTLFormatter()
-        css = formatter.get_rtl_css()
+        css = rtl_formatter.get_rtl_css()
 
         assert ".rtl-content code" in css
         assert ".rtl-content pre" in css
         assert "direction: ltr" in css
 
 
+@pytest.mark.usefixtures("mock_async_openai")
 class TestTranslationEngine:
     """Tests for TranslationEngine class."""
 
@@ -129,27 +183,17 @@ class TestTranslationEngine:
 
     def test_custom_model(self):
         """Test custom model configuration."""
-        with patch("app.services.translation_service.AsyncOpenAI"):
-            engine = TranslationEngine(model="gpt-4o")
-            assert engine.model == "gpt-4o"
+        engine = TranslationEngine(model="gpt-4o")
+        assert engine.model == "gpt-4o"
 
     @pytest.mark.asyncio
-    async def test_translate_to_urdu_calls_openai(self):
+    async def test_translate_to_urdu_calls_openai(self, fake_openai):
         """Test that translation calls OpenAI API."""
-        with patch("app.services.translation_service.AsyncOpenAI") as mock_openai:
-            mock_client = AsyncMock()
-            mock_openai.return_value = mock_client
-
-            mock_response = MagicMock()
-            mock_response.choices = [MagicMock()]
-            mock_response.choices[0].message.content = "اردو ترجمہ"
-            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
-
-            engine = TranslationEngine()
-            result = await engine.translate_to_urdu("Hello world")
+        engine = TranslationEngine()
+        result = await engine.translate_to_urdu("Hello world")
 
-            mock_client.chat.completions.create.assert_called_once()
-            assert result == "اردو ترجمہ"
+        fake_openai.chat.completions.create.assert_called_once()
+        assert result == "اردو ترجمہ"
 
 
 class TestTranslationCache:
@@ -160,79 +204,59 @@ class TestTranslationCache:
         cache = TranslationCache()
         assert cache is not None
 
-    @pytest.mark.asyncio
-    async def test_get_cached_translation_returns_none_when_no_pool(self):
-        """Test cache retrieval returns None when database pool is unavailable."""
-        with patch("app.services.translation_service.get_postgres_db") as mock_db:
-            mock_db.return_value.pool = None
-
-            cache = TranslationCache()
-            result = await cache.get_cached_translation("chapter-1", "ur")
-
-            assert result is None
-
-    @pytest.mark.asyncio
-    async def test_store_cached_translation_returns_false_when_no_pool(self):
-        """Test cache storage returns False when database pool is unavailable."""
-        with patch("app.services.translation_service.get_postgres_db") as mock_db:
-            mock_db.return_value.pool = None
-
-            cache = TranslationCache()
-            result = await cache.store_cached_translation(
-                "chapter-1", "translated content", "ur"
-            )
-
-            assert result is False
-
-    @pytest.mark.asyncio
-    async def test_invalidate_chapter_cache_returns_zero_when_no_pool(self):
-        """Test cache invalidation returns 0 when database pool is unavailable."""
-        with patch("app.services.translation_service.get_postgres_db") as mock_db:
-            mock_db.return_value.pool = None
+    @pytest.mark.parametrize(
+        "method,args,expected",
+        [
+            ("get_cached_translation", ("chapter-1", "ur"), None),
+            ("store_cached_translation", ("chapter-1", "translated content", "ur"), False),
+            ("invalidate_chapter_cache", ("chapter-1",), 0),
+        ],
+    )
+    async def test_returns_default_when_no_pool(self, no_pool_db, method, args, expected):
+        """Test cache operations return a default when database pool is unavailable."""
+        no_pool_db("app.services.translation_service")
 
-            cache = TranslationCache()
-            result = await cache.invalidate_chapter_cache("chapter-1")
+        result = await getattr(TranslationCache(), method)(*args)
 
-            assert result == 0
+        assert result == expected
+        assert type(result) is type(expected)
 
 
+@pytest.mark.usefixtures("mock_async_openai")
 class TestTranslationService:
     """Tests for TranslationService class."""
 
     def test_service_initialization(self):
         """Test service initialization with default components."""
-        with patch("app.services.translation_service.AsyncOpenAI"):
-            service = TranslationService()
+        service = TranslationService()
 
-            assert service.translation_engine is not None
-            assert service.rtl_formatter is not None
-            assert service.cache is not None
+        assert service.translation_engine is not None
+        assert service.rtl_formatter is not None
+        assert service.cache is not None
 
     def test_service_with_custom_components(self):
         """Test service initialization with custom components."""
-        with patch("app.services.translation_service.AsyncOpenAI"):
-            custom_engine = TranslationEngine(model="gpt-4o")
-            custom_formatter = RTLFormatter()
-            custom_cache = TranslationCache()
-
-            service = TranslationService(
-                translation_engine=custom_engine,
-                rtl_formatter=custom_formatter,
-                cache=custom_cache,
-            )
+        custom_engine = TranslationEngine(model="gpt-4o")
+        custom_formatter = RTLFormatter()
+        custom_cache = TranslationCache()
+
+        service = TranslationService(
+            translation_engine=custom_engine,
+            rtl_formatter=custom_formatter,
+            cache=custom_cache,
+        )
 
-            assert service.translation_engine is custom_engine
-            assert service.rtl_formatter is custom_formatter
-            assert service.cache is custom_cache
+        assert service.translation_engine is custom_engine
+        assert service.rtl_formatter is custom_formatter
+        assert service.cache is custom_cache
 
     def test_get_rtl_css(self):
         """Test getting RTL CSS from service."""
-        with patch("app.services.translation_service.AsyncOpenAI"):
-            service = TranslationService()
-            css = service.get_rtl_css()
+        service = TranslationService()
+        css = service.get_rtl_css()
 
-            assert ".rtl-content" in css
-            assert "direction: rtl" in css
+        assert ".rtl-content" in css
+        assert "direction: rtl" in css
 
 
 class TestTranslationModels:
@@ -276,62 +300,42 @@ class TestTranslationModels:
         assert response.has_rtl_formatting is True
 
 
+@pytest.mark.slow
 class TestTranslationEndpoints:
     """Tests for translation API endpoints."""
 
-    def test_translate_endpoint_requires_auth(self):
+    async def test_translate_endpoint_requires_auth(self, aclient):
         """Test that translate endpoint requires authentication."""
-        from fastapi.testclient import TestClient
-        from app.main import app
-
-        client = TestClient(app)
-        response = client.post(
+        response = await aclient.post(
             "/api/translate",
-            json={"chapter_id": "chapter-1", "content": "Hello"},
+            content=_AUTH_BODY,
+            headers=_JSON_HEADERS,
         )
 
         assert response.status_code == 401
 
-    def test_translate_endpoint_invalid_token(self):
+    async def test_translate_endpoint_invalid_token(self, aclient):
         """Test translate endpoint with invalid token."""
-        from fastapi.testclient import TestClient
-        from app.main import app
-
-        client = TestClient(app)
-        response = client.post(
+        response = await aclient.post(
             "/api/translate",
-            json={"chapter_id": "chapter-1", "content": "Hello"},
-            headers={"Authorization": "Bearer invalid_token"},
+            content=_AUTH_BODY,
+            headers={**_JSON_HEADERS, "Authorization": "Bearer invalid_token"},
         )
 
         assert response.status_code == 401
 
-    def test_rtl_css_endpoint(self):
+    @pytest.mark.usefixtures("reset_translation_service", "mock_async_openai")
+    async def test_rtl_css_endpoint(self, aclient):
         """Test RTL CSS endpoint returns CSS."""
-        from fastapi.testclient import TestClient
-        from app.main import app
-        import app.services.translation_service as ts
-
-        # Reset global service and mock OpenAI
-        ts._translation_service = None
-        with patch("app.services.translation_service.AsyncOpenAI"):
-            client = TestClient(app)
-            response = client.get("/api/translate/css")
+        response = await aclient.get("/api/translate/css")
 
-            assert response.status_code == 200
-            data = response.json()
-            assert "css" in data
-            assert ".rtl-content" in data["css"]
+        assert response.status_code == 200
+        data = response.json()
+        assert "css" in data
+        assert ".rtl-content" in data["css"]
 
-        # Clean up
-        ts._translation_service = None
-
-    def test_cache_invalidation_requires_auth(self):
+    async def test_cache_invalidation_requires_auth(self, aclient):
         """Test that cache invalidation requires authentication."""
-        from fastapi.testclient import TestClient
-        from app.main import app
-
-        client = TestClient(app)
-        response = client.delete("/api/translate/cache/chapter-1")
+        response = await aclient.delete("/api/translate/cache/chapter-1")
 
         assert response.status_code == 401